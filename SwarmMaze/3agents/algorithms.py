@@ -1,33 +1,84 @@
 from collections import deque
 import heapq
+import math
+
+# Every solver searches over (position, time) states. Frontier entries hold only
+# the state (plus its priority); each state's predecessor is kept in a `parents`
+# dict and the exploration trace is one list shared by the whole search, so no
+# entry carries a copy of its path or trace.
+
+def manhattan(a, b):
+    """Manhattan distance between two cells, the heuristic of A* and Greedy"""
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+def goal_distances(maze, goal):
+    """
+    True shortest distance from every cell to the goal, ignoring reservations
+    (reverse BFS over the static maze). Cells missing from the result cannot reach
+    the goal at all. The map is cached on the maze, one per goal.
+    """
+    cache = maze.__dict__.setdefault("goal_distances", {})
+    if goal not in cache:
+        distances = {goal: 0}
+        queue = deque([goal])
+        while queue:
+            position = queue.popleft()
+            for neighbor in maze.neighbors(position):
+                if neighbor not in distances:
+                    distances[neighbor] = distances[position] + 1
+                    queue.append(neighbor)
+        cache[goal] = distances
+    return cache[goal]
+
+def arrival_heuristic(distances, goal, position, time, reservation=None):
+    """
+    Steps left before (position, time) can reach the goal: the true distance,
+    extended while the goal cell is reserved at the arrival time (the agent has
+    to wait for it somewhere). Never overestimates, so A* stays optimal.
+    """
+    arrival = time + distances[position]
+    if reservation:
+        while reservation.is_reserved(goal, arrival):
+            arrival += 1
+    return arrival - time
+
+def reconstruct_path(parents, state):
+    """Positions from the search root to a (position, time) state, following parent pointers"""
+    path = []
+    while state is not None:
+        path.append(state[0])
+        state = parents[state]
+    path.reverse()
+    return path
 
 class BFS:
     """Breadth-First Search with time-based reservations"""
     @staticmethod
     def solve(maze, start, goal, reservation=None):
-        queue = deque([(start, [start], 0)])  # (position, path, time)
-        visited = set([(start, 0)])  # (position, time)
+        queue = deque([(start, 0)])  # (position, time)
+        parents = {(start, 0): None}  # (position, time) -> previous (position, time); also the visited set
         exploration_trace = []
 
         while queue:
-            position, path, time = queue.popleft()
+            state = queue.popleft()
+            position, time = state
             exploration_trace.append(position)
 
             if position == goal:
-                return path, exploration_trace
+                return reconstruct_path(parents, state), exploration_trace
 
             for neighbor in maze.neighbors(position):
                 if reservation and reservation.is_reserved(neighbor, time + 1):  # Use is_reserved
                     continue
-                if (neighbor, time + 1) not in visited:
-                    visited.add((neighbor, time + 1))
-                    queue.append((neighbor, path + [neighbor], time + 1))
+                if (neighbor, time + 1) not in parents:
+                    parents[(neighbor, time + 1)] = state
+                    queue.append((neighbor, time + 1))
 
             # Waiting in place is also an option
             if not reservation or not reservation.is_reserved(position, time + 1):  # Use is_reserved
-                if (position, time + 1) not in visited:
-                    visited.add((position, time + 1))
-                    queue.append((position, path + [position], time + 1))
+                if (position, time + 1) not in parents:
+                    parents[(position, time + 1)] = state
+                    queue.append((position, time + 1))
 
         return [start], exploration_trace
 
@@ -36,19 +87,21 @@ class DFS:
     """Depth-First Search with time-based reservations"""
     @staticmethod
     def solve(maze, start, goal, reservation=None):
-        stack = [(start, [start], 0)]  # (position, path, time)
-        visited = set([(start, 0)])  # (position, time)
+        stack = [(start, 0)]  # (position, time)
+        parents = {(start, 0): None}  # (position, time) -> previous (position, time); also the visited set
         exploration_trace = []
         MAX_DEPTH = 100
 
         while stack:
-            position, path, time = stack.pop()
+            state = stack.pop()
+            position, time = state
             exploration_trace.append(position)
 
             if position == goal:
-                return path, exploration_trace
+                return reconstruct_path(parents, state), exploration_trace
 
-            if len(path) > MAX_DEPTH:
+            # The path to this state has time + 1 cells
+            if time + 1 > MAX_DEPTH:
                 continue
 
             neighbors = list(maze.neighbors(position))
@@ -58,81 +111,190 @@ class DFS:
             for neighbor in neighbors:
                 if reservation and reservation.is_reserved(neighbor, time + 1):  # Use is_reserved
                     continue
-                if (neighbor, time + 1) not in visited:
+                if (neighbor, time + 1) not in parents:
                     valid_moves.append(neighbor)
 
             if valid_moves:
                 for neighbor in valid_moves:
-                    visited.add((neighbor, time + 1))
-                    stack.append((neighbor, path + [neighbor], time + 1))
+                    parents[(neighbor, time + 1)] = state
+                    stack.append((neighbor, time + 1))
             else:
                 if not reservation or not reservation.is_reserved(position, time + 1):  # Use is_reserved
-                    if (position, time + 1) not in visited:
-                        visited.add((position, time + 1))
-                        stack.append((position, path + [position], time + 1))
+                    if (position, time + 1) not in parents:
+                        parents[(position, time + 1)] = state
+                        stack.append((position, time + 1))
 
         return [start], exploration_trace
 
 
 class AStar:
-    """A* Search with time-based reservations"""
+    """Space-time A* with time-based reservations"""
     @staticmethod
-    def solve(maze, start, goal, reservation=None):
-        open_set = [(0, 0, start, [start], [])]  # (f, time, position, path, exploration)
+    def solve(maze, start, goal, reservation=None, horizon=None):
+        """
+        Searches (position, time) states, moving or waiting one step at a time.
+        The heuristic is the true distance to the goal, plus any wait forced by
+        reservations of the goal cell itself. After the last reserved time step
+        every time is alike, so those states collapse into one per cell and the
+        search always terminates.
+        :param horizon: Optional latest arrival time; later states are not expanded.
+        """
+        distances = goal_distances(maze, goal)
+        if start not in distances:
+            return [start], []  # Walls cut the start off from the goal: no reservation can help
+
+        # Times after `settled` are interchangeable, so they share one closed-set key
+        settled = reservation.last_time + 1 if reservation else 0
+
+        h = arrival_heuristic(distances, goal, start, 0, reservation)
+        open_set = [(h, h, (start, 0))]  # (f, h, (position, time)); f ties go to the state nearer the goal
         closed_set = set()
-        g_score = {(start, 0): 0}
+        parents = {(start, 0): None}
         exploration_trace = []
 
         while open_set:
-            f, time, current, path, exploration = heapq.heappop(open_set)
-            exploration_trace = exploration + [current]
+            f, h, state = heapq.heappop(open_set)
+            current, time = state
+            key = (current, min(time, settled))
+            if key in closed_set:
+                continue
+            closed_set.add(key)
+            exploration_trace.append(current)
 
             if current == goal:
-                return path, exploration_trace
+                return reconstruct_path(parents, state), exploration_trace
 
-            if (current, time) in closed_set:
+            if horizon is not None and time >= horizon:
                 continue
 
-            closed_set.add((current, time))
-
             for neighbor in maze.neighbors(current) + [current]:
-                if reservation and reservation.is_reserved(neighbor, time + 1):  # Use is_reserved
+                if reservation and (reservation.is_reserved(neighbor, time + 1)
+                                    or reservation.is_move_reserved(current, neighbor, time)):
                     continue
-                if (neighbor, time + 1) in closed_set:
+                # Every step costs 1, so the first state to reach (neighbor, time + 1) is the cheapest
+                if (neighbor, min(time + 1, settled)) in closed_set or (neighbor, time + 1) in parents:
                     continue
+                parents[(neighbor, time + 1)] = state
+                h = arrival_heuristic(distances, goal, neighbor, time + 1, reservation)
+                heapq.heappush(open_set, (time + 1 + h, h, (neighbor, time + 1)))
+
+        return [start], exploration_trace
+
+
+class SIPP:
+    """Safe Interval Path Planning over the reservation table"""
+    @staticmethod
+    def solve(maze, start, goal, reservation=None, horizon=None):
+        """
+        Searches (position, interval) states, where an interval is a maximal run of
+        time steps during which the cell is free (ReservationTable.safe_intervals).
+        Each state keeps its earliest arrival time; waiting inside an interval is
+        implicit, so a cell reserved at only a few times costs a few states rather
+        than one per time step. Returns the same per-time-step path as the other
+        solvers, with the waits written out.
+        :param horizon: Optional latest arrival time; later arrivals are not queued.
+        """
+        distances = goal_distances(maze, goal)
+        if start not in distances:
+            return [start], []  # Walls cut the start off from the goal: no reservation can help
+
+        intervals_of = {}  # position -> its safe intervals, looked up once per search
+
+        def intervals(position):
+            if position not in intervals_of:
+                intervals_of[position] = reservation.safe_intervals(position) if reservation else [(0, math.inf)]
+            return intervals_of[position]
+
+        if intervals(start)[0][0] > 0:
+            return [start], []  # The start itself is taken at time 0
+
+        h = arrival_heuristic(distances, goal, start, 0, reservation)
+        open_set = [(h, h, (start, 0))]  # (f, h, (position, interval index))
+        arrivals = {(start, 0): 0}  # (position, interval index) -> earliest arrival time found
+        parents = {(start, 0): None}
+        closed_set = set()
+        exploration_trace = []
 
-                g = g_score.get((current, time), float('inf')) + 1
-                if (neighbor, time + 1) not in g_score or g < g_score[(neighbor, time + 1)]:
-                    g_score[(neighbor, time + 1)] = g
-                    h = abs(neighbor[0] - goal[0]) + abs(neighbor[1] - goal[1])
-                    f = g + h
-                    heapq.heappush(open_set, (f, time + 1, neighbor, path + [neighbor], exploration_trace.copy()))
+        while open_set:
+            f, h, state = heapq.heappop(open_set)
+            if state in closed_set:
+                continue
+            closed_set.add(state)
+            current, index = state
+            time = arrivals[state]
+            exploration_trace.append(current)
+
+            if current == goal:
+                return SIPP.timed_path(parents, arrivals, state), exploration_trace
+
+            # The agent may wait here until its interval ends, then step out one time step later
+            last = intervals(current)[index][1]
+            for neighbor in maze.neighbors(current):
+                for neighbor_index, (first, end) in enumerate(intervals(neighbor)):
+                    if first > last + 1:
+                        break
+                    if end < time + 1:
+                        continue
+                    arrival = max(time + 1, first)
+                    if reservation:
+                        # A forbidden move (a swap) can still be made a step later, if both cells allow it
+                        latest = min(last + 1, end)
+                        while arrival <= latest and reservation.is_move_reserved(current, neighbor, arrival - 1):
+                            arrival += 1
+                        if arrival > latest:
+                            continue
+                    if horizon is not None and arrival > horizon:
+                        continue
+                    successor = (neighbor, neighbor_index)
+                    if successor in closed_set or arrival >= arrivals.get(successor, math.inf):
+                        continue
+                    arrivals[successor] = arrival
+                    parents[successor] = state
+                    h = arrival_heuristic(distances, goal, neighbor, arrival, reservation)
+                    heapq.heappush(open_set, (arrival + h, h, successor))
 
         return [start], exploration_trace
 
+    @staticmethod
+    def timed_path(parents, arrivals, state):
+        """One position per time step from the start to `state`, repeating a cell while the agent waits"""
+        states = []
+        while state is not None:
+            states.append(state)
+            state = parents[state]
+        states.reverse()
+
+        path = [states[0][0]]
+        for position, index in states[1:]:
+            arrival = arrivals[(position, index)]
+            path.extend([path[-1]] * (arrival - len(path)))  # wait until the step into `position`
+            path.append(position)
+        return path
+
 
 class Greedy:
     """Greedy Best-First Search with time-based reservations"""
     @staticmethod
     def solve(maze, start, goal, reservation=None):
-        open_set = [(0, 0, start, [start], [])]  # (h, time, position, path, exploration)
-        visited = set([(start, 0)])
+        open_set = [(0, 0, (start, 0))]  # (h, time, (position, time))
+        parents = {(start, 0): None}  # (position, time) -> previous (position, time); also the visited set
         exploration_trace = []
 
         while open_set:
-            h, time, current, path, exploration = heapq.heappop(open_set)
-            exploration_trace = exploration + [current]
+            h, time, state = heapq.heappop(open_set)
+            current = state[0]
+            exploration_trace.append(current)
 
             if current == goal:
-                return path, exploration_trace
+                return reconstruct_path(parents, state), exploration_trace
 
             for neighbor in maze.neighbors(current) + [current]:
                 if reservation and reservation.is_reserved(neighbor, time + 1):  # Use is_reserved
                     continue
-                if (neighbor, time + 1) not in visited:
-                    visited.add((neighbor, time + 1))
-                    h = abs(neighbor[0] - goal[0]) + abs(neighbor[1] - goal[1])
-                    heapq.heappush(open_set, (h, time + 1, neighbor, path + [neighbor], exploration_trace.copy()))
+                if (neighbor, time + 1) not in parents:
+                    parents[(neighbor, time + 1)] = state
+                    h = manhattan(neighbor, goal)
+                    heapq.heappush(open_set, (h, time + 1, (neighbor, time + 1)))
 
         return [start], exploration_trace
 
@@ -141,27 +303,31 @@ class Dijkstra:
     """Dijkstra's Algorithm with time-based reservations"""
     @staticmethod
     def solve(maze, start, goal, reservation=None):
-        open_set = [(0, start, [start], 0)]  # (cost, position, path, time)
+        open_set = [(0, (start, 0))]  # (cost, (position, time))
         visited = set()
+        parents = {(start, 0): None}  # first state that queued each (position, time)
         exploration_trace = []
 
         while open_set:
-            cost, position, path, time = heapq.heappop(open_set)
+            cost, state = heapq.heappop(open_set)
+            position, time = state
             exploration_trace.append(position)
 
             if position == goal:
-                return path, exploration_trace
+                return reconstruct_path(parents, state), exploration_trace
 
-            if (position, time) in visited:
+            if state in visited:
                 continue
 
-            visited.add((position, time))
+            visited.add(state)
 
             for neighbor in maze.neighbors(position):
                 if reservation and reservation.is_reserved(neighbor, time + 1):
                     continue
                 if (neighbor, time + 1) not in visited:
-                    heapq.heappush(open_set, (cost + 1, neighbor, path + [neighbor], time + 1))
+                    # Every step costs 1, so the first state to queue a neighbor is as cheap as any later one
+                    parents.setdefault((neighbor, time + 1), state)
+                    heapq.heappush(open_set, (cost + 1, (neighbor, time + 1)))
 
         return [start], exploration_trace
 
@@ -170,42 +336,50 @@ class BidirectionalSearch:
     """Bidirectional Search with time-based reservations"""
     @staticmethod
     def solve(maze, start, goal, reservation=None):
-        frontier_start = deque([(start, [start], 0)])  # (position, path, time)
-        frontier_goal = deque([(goal, [goal], 0)])  # (position, path, time)
-        visited_start = {}
-        visited_goal = {}
+        frontier_start = deque([(start, 0)])  # (position, time)
+        frontier_goal = deque([(goal, 0)])  # (position, time)
+        parents_start = {(start, 0): None}
+        parents_goal = {(goal, 0): None}
+        visited_start = {}  # position -> time it was last expanded from the start side
+        visited_goal = {}  # position -> time it was last expanded from the goal side
         exploration_trace = []
 
         while frontier_start and frontier_goal:
             # Expand from start
-            position, path, time = frontier_start.popleft()
+            state = frontier_start.popleft()
+            position, time = state
             exploration_trace.append(position)
 
             if position in visited_goal:
-                return path + visited_goal[position][::-1], exploration_trace
+                return (reconstruct_path(parents_start, state)
+                        + reconstruct_path(parents_goal, (position, visited_goal[position]))[::-1]), exploration_trace
 
-            visited_start[position] = path
+            visited_start[position] = time
 
             for neighbor in maze.neighbors(position):
                 if reservation and reservation.is_reserved(neighbor, time + 1):
                     continue
                 if neighbor not in visited_start:
-                    frontier_start.append((neighbor, path + [neighbor], time + 1))
+                    parents_start.setdefault((neighbor, time + 1), state)
+                    frontier_start.append((neighbor, time + 1))
 
             # Expand from goal
-            position, path, time = frontier_goal.popleft()
+            state = frontier_goal.popleft()
+            position, time = state
             exploration_trace.append(position)
 
             if position in visited_start:
-                return visited_start[position] + path[::-1], exploration_trace
+                return (reconstruct_path(parents_start, (position, visited_start[position]))
+                        + reconstruct_path(parents_goal, state)[::-1]), exploration_trace
 
-            visited_goal[position] = path
+            visited_goal[position] = time
 
             for neighbor in maze.neighbors(position):
                 if reservation and reservation.is_reserved(neighbor, time + 1):
                     continue
                 if neighbor not in visited_goal:
-                    frontier_goal.append((neighbor, path + [neighbor], time + 1))
+                    parents_goal.setdefault((neighbor, time + 1), state)
+                    frontier_goal.append((neighbor, time + 1))
 
         return [start], exploration_trace
 
@@ -214,28 +388,34 @@ class IterativeDeepeningDFS:
     """Iterative Deepening Depth-First Search with time-based reservations"""
     @staticmethod
     def solve(maze, start, goal, reservation=None):
-        def depth_limited_search(position, path, time, depth):
+        # One path and one trace are shared by the whole recursion of an iteration
+        path = [start]
+        on_path = {start}
+        exploration_trace = []
+
+        def depth_limited_search(position, time, depth):
             if depth == 0:
-                return None, []
+                return False
+            exploration_trace.append(position)
             if position == goal:
-                return path, [position]
-
-            exploration_trace = [position]
+                return True
 
             for neighbor in maze.neighbors(position):
                 if reservation and reservation.is_reserved(neighbor, time + 1):
                     continue
-                if neighbor not in path:
-                    result, trace = depth_limited_search(neighbor, path + [neighbor], time + 1, depth - 1)
-                    exploration_trace.extend(trace)
-                    if result:
-                        return result, exploration_trace
+                if neighbor not in on_path:
+                    path.append(neighbor)
+                    on_path.add(neighbor)
+                    if depth_limited_search(neighbor, time + 1, depth - 1):
+                        return True
+                    path.pop()
+                    on_path.discard(neighbor)
 
-            return None, exploration_trace
+            return False
 
         depth = 1
         while True:
-            result, exploration_trace = depth_limited_search(start, [start], 0, depth)
-            if result:
-                return result, exploration_trace
-            depth += 1
\ No newline at end of file
+            exploration_trace.clear()
+            if depth_limited_search(start, 0, depth):
+                return list(path), exploration_trace
+            depth += 1
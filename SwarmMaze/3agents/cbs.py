@@ -0,0 +1,233 @@
+import heapq
+import itertools
+
+from algorithms import AStar, SIPP
+from reservation import ReservationTable
+from config import CBS_LOW_LEVEL, CBS_NODE_LIMIT, ECBS_SUBOPTIMALITY
+
+# Single-agent planners CBS can run as its low level: both find the earliest
+# arrival and honour move reservations, so every constraint is respected
+LOW_LEVEL = {"astar": AStar, "sipp": SIPP}
+
+# Multi-agent algorithm names accepted by main_3a.py and performance_metrics.py,
+# with their suboptimality bound (1.0 is plain, optimal CBS)
+MULTI_AGENT_ALGORITHMS = {"cbs": 1.0, "ecbs": ECBS_SUBOPTIMALITY}
+
+def find_conflicts(paths):
+    """
+    Every conflict between the agents' paths, earliest first. Positions and moves
+    are indexed one time step at a time, so each step costs one pass over the agents.
+    An agent leaves the maze on reaching its goal: its path only occupies cells up
+    to its last step.
+    A conflict is ("vertex", time, position, agent_a, agent_b), two agents in one cell,
+    or ("move", time, (position_a, position_b), agent_a, agent_b), the agents swapping
+    cells between time and time + 1.
+    """
+    conflicts = []
+    horizon = max((len(path) for path in paths.values()), default=0)
+    for time in range(horizon):
+        cells = {}  # position -> agent there at this time step
+        moves = {}  # (position, next position) -> agent making that move after this time step
+        for agent_id, path in paths.items():
+            if time >= len(path):
+                continue
+            position = path[time]
+            if position in cells:
+                conflicts.append(("vertex", time, position, cells[position], agent_id))
+            else:
+                cells[position] = agent_id
+            if time + 1 < len(path) and path[time + 1] != position:
+                following = path[time + 1]
+                if (following, position) in moves:
+                    conflicts.append(("move", time, (following, position), moves[(following, position)], agent_id))
+                moves[(position, following)] = agent_id
+    return conflicts
+
+def constraint_table(constraints):
+    """ReservationTable holding one agent's constraints, for the low-level planner"""
+    table = ReservationTable()
+    for kind, place, time, other in constraints:
+        if kind == "vertex":
+            table.add_reservation(place, time, other)
+        else:
+            table.add_move_reservation(place[0], place[1], time, other)
+    return table
+
+def reserve_paths(table, paths):
+    """Reserve other agents' paths in a table: their cells, and the moves that would swap with them"""
+    for agent_id, path in paths.items():
+        for t, pos in enumerate(path):
+            table.add_reservation(pos, t, agent_id)
+        for t in range(len(path) - 1):
+            if path[t] != path[t + 1]:
+                table.add_move_reservation(path[t + 1], path[t], t, agent_id)
+    return table
+
+def crosses(table, path):
+    """Whether a path enters a reserved cell or makes a reserved move"""
+    return any(table.is_reserved(path[t], t) or table.is_move_reserved(path[t - 1], path[t], t - 1)
+               for t in range(1, len(path)))
+
+class CBSNode:
+    """One high-level node: per-agent constraints and the paths planned under them"""
+    def __init__(self, constraints, paths, traces, bounds):
+        self.constraints = constraints  # agent_id -> frozenset of (kind, place, time, other agent)
+        self.paths = paths
+        self.traces = traces
+        self.bounds = bounds  # agent_id -> optimal arrival time under its constraints
+        self.cost = sum(len(path) - 1 for path in paths.values())  # Sum of arrival times
+        self.lower_bound = sum(bounds.values())  # No plan under these constraints costs less
+        self.conflicts = find_conflicts(paths)
+        self.closed = False  # Expanded; entries left in the open heaps are skipped
+
+class ConflictBasedSearch:
+    """
+    Conflict-Based Search for any number of agents. Each agent is planned alone by
+    a single-agent search; whenever two paths conflict, the high level branches on
+    which of the two agents gets a constraint forbidding it, and replans only that
+    agent. Unlike prioritized planning, no agent is sacrificed for an earlier one.
+    Each node also keeps a lower bound, the sum of the agents' optimal arrivals
+    under their constraints.
+    With suboptimality w > 1 it runs as ECBS: a node may cost up to w times its
+    lower bound, so a replanned agent whose optimal path crosses the others' current
+    paths looks for one that keeps clear of them within what is left of that
+    allowance. Among the open nodes costing at most w times the lowest lower bound,
+    it expands the one with the fewest conflicts, which finds a plan much sooner and
+    costs at most w times the optimum. Plain CBS (w = 1) has no allowance to spend
+    and keeps the optimal paths.
+    """
+    def __init__(self, maze, suboptimality=1.0, low_level=CBS_LOW_LEVEL, node_limit=CBS_NODE_LIMIT):
+        if suboptimality < 1:
+            raise Exception("CBS suboptimality must be at least 1")
+        if low_level not in LOW_LEVEL:
+            raise Exception(f"CBS low level must be one of {', '.join(LOW_LEVEL)}")
+        self.maze = maze
+        self.suboptimality = suboptimality
+        self.low_level = LOW_LEVEL[low_level]
+        self.node_limit = node_limit
+        self.expanded = 0  # High-level nodes expanded by the last plan() call
+        self.generated = 0  # High-level nodes created by the last plan() call
+
+    def plan(self, starts, goals):
+        """
+        Plan conflict-free paths for every agent.
+        :param starts: agent_id -> start position.
+        :param goals: agent_id -> goal position.
+        :return: (paths, exploration_traces), both dicts keyed by agent_id, or None when
+        some agent cannot reach its goal or no plan was found within the node limit.
+        """
+        self.expanded = 0
+        self.generated = 0
+        goals = dict(goals)
+
+        # Root: every agent's shortest path, then (ECBS only) agent by agent, a detour
+        # around those planned before it while the root's allowance lasts
+        paths, traces, bounds = {}, {}, {}
+        for agent_id, start in starts.items():
+            result = self.shortest(start, goals[agent_id], frozenset())
+            if result is None:
+                return None
+            paths[agent_id], traces[agent_id] = result
+            bounds[agent_id] = len(paths[agent_id]) - 1
+        if self.suboptimality > 1:
+            allowance = self.suboptimality * sum(bounds.values())
+            cost = sum(bounds.values())
+            planned = {}
+            for agent_id, start in starts.items():
+                horizon = int(allowance - cost + bounds[agent_id])
+                detour = self.detour(start, goals[agent_id], frozenset(), planned, paths[agent_id], horizon)
+                if detour:
+                    paths[agent_id], traces[agent_id] = detour
+                    cost += len(paths[agent_id]) - 1 - bounds[agent_id]
+                planned[agent_id] = paths[agent_id]
+        root = CBSNode(dict.fromkeys(starts, frozenset()), paths, traces, bounds)
+
+        # Open nodes are in `lower` (by lower bound) and in either `waiting` (by cost)
+        # or `focal` (by conflicts), the latter holding those within the bound
+        serial = itertools.count()
+        lower, waiting, focal = [], [], []
+
+        def push(node):
+            self.generated += 1
+            order = next(serial)
+            heapq.heappush(lower, (node.lower_bound, order, node))
+            heapq.heappush(waiting, (node.cost, order, node))
+
+        push(root)
+        while self.expanded < self.node_limit:
+            while lower and lower[0][2].closed:
+                heapq.heappop(lower)
+            if not lower:
+                return None
+            bound = self.suboptimality * lower[0][0]
+            while waiting and waiting[0][0] <= bound:
+                cost, order, node = heapq.heappop(waiting)
+                heapq.heappush(focal, (len(node.conflicts), cost, order, node))
+
+            node = heapq.heappop(focal)[-1]
+            node.closed = True
+            self.expanded += 1
+            if not node.conflicts:
+                return node.paths, node.traces
+
+            kind, time, place, agent_a, agent_b = node.conflicts[0]
+            if kind == "vertex":
+                branches = [(agent_a, (kind, place, time, agent_b)), (agent_b, (kind, place, time, agent_a))]
+            else:
+                branches = [(agent_a, (kind, place, time, agent_b)), (agent_b, (kind, place[::-1], time, agent_a))]
+
+            for agent_id, constraint in branches:
+                constraints = dict(node.constraints)
+                constraints[agent_id] = node.constraints[agent_id] | {constraint}
+                others = {other: path for other, path in node.paths.items() if other != agent_id}
+                # What the other agents leave of the node's allowance
+                slack = (self.suboptimality * (node.lower_bound - node.bounds[agent_id])
+                         - (node.cost - (len(node.paths[agent_id]) - 1)))
+                result = self.replan(starts[agent_id], goals[agent_id], constraints[agent_id], others, slack)
+                if result is None:
+                    continue  # This agent cannot satisfy the new constraint
+                paths, traces, bounds = dict(node.paths), dict(node.traces), dict(node.bounds)
+                paths[agent_id], traces[agent_id], bounds[agent_id] = result
+                push(CBSNode(constraints, paths, traces, bounds))
+
+        return None
+
+    def replan(self, start, goal, constraints, others, slack):
+        """
+        Low-level search for one agent under its constraints.
+        :param others: agent_id -> current path of the other agents, avoided when
+        affordable (ECBS only).
+        :param slack: Steps the agent may arrive later than w times its optimal arrival.
+        :return: (path, exploration_trace, optimal arrival time), or None if the agent
+        cannot reach its goal.
+        """
+        result = self.shortest(start, goal, constraints)
+        if result is None:
+            return None
+        bound = len(result[0]) - 1
+        if self.suboptimality == 1:
+            return result + (bound,)
+        detour = self.detour(start, goal, constraints, others, result[0], int(self.suboptimality * bound + slack))
+        return (detour or result) + (bound,)
+
+    def shortest(self, start, goal, constraints):
+        """Optimal (path, exploration_trace) of one agent under its constraints, or None if there is none"""
+        path, exploration = self.low_level.solve(self.maze, start, goal, constraint_table(constraints))
+        if path[-1] != goal:
+            return None
+        return path, exploration
+
+    def detour(self, start, goal, constraints, others, path, horizon):
+        """
+        (path, exploration_trace) keeping clear of the others' paths and arriving by
+        `horizon`, or None when `path` is already clear of them or no such path exists.
+        """
+        if not others:
+            return None
+        table = reserve_paths(constraint_table(constraints), others)
+        if not crosses(table, path):
+            return None
+        avoiding, exploration = self.low_level.solve(self.maze, start, goal, table, horizon=horizon)
+        if avoiding[-1] != goal:
+            return None
+        return avoiding, exploration
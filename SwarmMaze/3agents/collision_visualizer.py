@@ -1,15 +1,16 @@
 import pygame
 import sys
-from maze import Maze, Visualizer, PathFinder  # Add PathFinder import
-from reservation import ReservationTable
-from config import PATH_COLORS, RESERVATION_COLOR, COLLISION_COLOR, CELL_SIZE, WHITE, BLACK, GREEN, BLUE
+from maze import Maze, Visualizer, LISTED_AGENTS
+from main_3a import plan_paths
+from config import path_palette, RESERVATION_COLOR, COLLISION_COLOR, CELL_SIZE, WHITE, BLACK, GREEN, BLUE
 
 class CollisionVisualizer:
     def __init__(self, maze):
         self.maze = maze
         self.visualizer = Visualizer(maze)
+        self.path_colors = path_palette(maze.starts)
 
-    def visualize_collision_avoidance(self, agent_paths, reservation):
+    def visualize_collision_avoidance(self, agent_ids, agent_paths, reservation):
         """Visualize the collision avoidance mechanism step by step."""
         running = True
         clock = pygame.time.Clock()
@@ -38,7 +39,7 @@ class CollisionVisualizer:
             collisions = self.detect_collisions(current_positions)
 
             # Draw maze with reservation table, current positions, and collisions
-            self.draw_with_reservations(current_positions, reservation, step, collisions)
+            self.draw_with_reservations(agent_ids, current_positions, reservation, step, collisions)
 
             # Display reservation table in the console for debugging
             print(f"Step {step}: Reservation Table")
@@ -67,7 +68,7 @@ class CollisionVisualizer:
                 seen.add(pos)
         return collisions
 
-    def draw_with_reservations(self, agent_positions, reservation, current_time, collisions):
+    def draw_with_reservations(self, agent_ids, agent_positions, reservation, current_time, collisions):
         """Draw the maze with reservations and collisions highlighted."""
         # Fill background
         self.visualizer.screen.fill(BLACK)
@@ -83,8 +84,8 @@ class CollisionVisualizer:
                 if self.maze.walls[i][j]:
                     pygame.draw.rect(self.visualizer.screen, WHITE, rect)
 
-                # Draw goal
-                elif self.maze.goal and (i, j) == self.maze.goal:
+                # Draw goals
+                elif (i, j) in self.visualizer.goal_cells:
                     pygame.draw.rect(self.visualizer.screen, GREEN, rect)
 
                 # Draw grid lines
@@ -106,11 +107,11 @@ class CollisionVisualizer:
             pygame.draw.rect(self.visualizer.screen, COLLISION_COLOR, rect)
 
         # Draw agents
-        for pos, agent_id in zip(agent_positions, range(1, len(agent_positions) + 1)):
+        for pos, agent_id in zip(agent_positions, agent_ids):
             x = pos[1] * CELL_SIZE
             y = pos[0] * CELL_SIZE
             rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
-            color = PATH_COLORS.get(agent_id, BLUE)
+            color = self.path_colors.get(agent_id, BLUE)
             pygame.draw.rect(self.visualizer.screen, color, rect)
 
         # Update display
@@ -119,17 +120,19 @@ class CollisionVisualizer:
     def draw_legend(self):
         """Draw a legend explaining the colors used in the visualization."""
         font = pygame.font.SysFont(None, 24)
+        agents = sorted(self.path_colors.items())
         legend_items = [
             ("Reserved Cell", RESERVATION_COLOR),
             ("Collision", COLLISION_COLOR),
-            ("Agent 1", PATH_COLORS.get(1, BLUE)),
-            ("Agent 2", PATH_COLORS.get(2, BLUE)),
-            ("Agent 3", PATH_COLORS.get(3, BLUE)),
-            ("Goal", GREEN),
-        ]
+        ] + [(f"Agent {agent_id}", color) for agent_id, color in agents[:LISTED_AGENTS]]
+        # Scenario-scale runs would list hundreds of agents: summarize the rest
+        if len(agents) > LISTED_AGENTS:
+            legend_items.append((f"... and {len(agents) - LISTED_AGENTS} more agents", None))
+        legend_items.append(("Goal", GREEN))
         x, y = 10, self.maze.height * CELL_SIZE + 10
         for text, color in legend_items:
-            pygame.draw.rect(self.visualizer.screen, color, (x, y, 20, 20))
+            if color is not None:
+                pygame.draw.rect(self.visualizer.screen, color, (x, y, 20, 20))
             label = font.render(text, True, WHITE)
             self.visualizer.screen.blit(label, (x + 30, y))
             y += 30
@@ -137,7 +140,7 @@ class CollisionVisualizer:
 if __name__ == "__main__":
     # Example usage
     if len(sys.argv) < 2:
-        sys.exit("Usage: python collision_visualizer.py maze4_3a.txt [algorithm]")
+        sys.exit("Usage: python collision_visualizer.py maze4_3a.txt|scenario.json [algorithm]")
 
     maze_file = sys.argv[1]
     algorithm = "bfs"  # Default to BFS
@@ -149,25 +152,14 @@ if __name__ == "__main__":
 
     maze = Maze(maze_file)
 
-    # Initialize pathfinder
-    pathfinder = PathFinder(maze)
-
-    # Dynamically compute paths for agents
-    agent_paths = []
-    reservation = ReservationTable()
-    for agent_id, start in maze.starts.items():
-        path, _ = pathfinder.find_path(algorithm, start, maze.goal, reservation)
-        agent_paths.append(path)
-
-        # Update reservation table
-        for t, pos in enumerate(path):
-            reservation.add_reservation(pos, t, agent_id)
+    # Plan every agent (prioritized with reservations, or jointly with CBS/ECBS)
+    agent_ids, agent_paths, _, reservation = plan_paths(maze, algorithm)
 
     # Validate paths to ensure no agent passes through walls
-    for agent_id, path in enumerate(agent_paths, start=1):
+    for agent_id, path in zip(agent_ids, agent_paths):
         for pos in path:
             if not maze.is_valid_position(pos):
                 raise ValueError(f"Agent {agent_id} path includes invalid position {pos} (wall or out of bounds).")
 
     visualizer = CollisionVisualizer(maze)
-    visualizer.visualize_collision_avoidance(agent_paths, reservation)
\ No newline at end of file
+    visualizer.visualize_collision_avoidance(agent_ids, agent_paths, reservation)
\ No newline at end of file
@@ -1,3 +1,5 @@
+import colorsys
+
 # Visualization settings
 CELL_SIZE = 30
 WHITE = (255, 255, 255)  # Wall
@@ -20,6 +22,23 @@ PATH_COLORS = {
     3: (200, 100, 200)    # Light purple
 }
 
+# Agents beyond the ones listed above get generated colors: hues spread by the
+# golden ratio, repeating every PALETTE_SIZE agents so frame palettes stay small
+PALETTE_SIZE = 60
+
+def generated_color(agent_id, saturation, value):
+    """Generated (r, g, b) color of an agent"""
+    hue = (agent_id % PALETTE_SIZE) * 0.618033988749895 % 1.0
+    return tuple(round(c * 255) for c in colorsys.hsv_to_rgb(hue, saturation, value))
+
+def agent_palette(agent_ids):
+    """Agent marker colors for any set of agent IDs: AGENT_COLORS first, then generated ones"""
+    return {agent_id: AGENT_COLORS.get(agent_id) or generated_color(agent_id, 1.0, 0.8) for agent_id in agent_ids}
+
+def path_palette(agent_ids):
+    """Lighter path colors for any set of agent IDs: PATH_COLORS first, then generated ones"""
+    return {agent_id: PATH_COLORS.get(agent_id) or generated_color(agent_id, 0.45, 1.0) for agent_id in agent_ids}
+
 # Shared path color
 SHARED_PATH_COLOR = (150, 150, 150)  # Gray
 
@@ -29,3 +48,8 @@ COLLISION_COLOR = (255, 255, 0)  # Yellow for collisions
 
 # Algorithm defaults
 DEFAULT_ALGORITHM = "bfs"
+
+# Conflict-Based Search (cbs.py)
+CBS_LOW_LEVEL = "astar"     # Single-agent planner used by CBS: "astar" or "sipp"
+CBS_NODE_LIMIT = 10000      # High-level nodes expanded before CBS gives up
+ECBS_SUBOPTIMALITY = 1.5    # ECBS returns plans costing at most this factor times the optimum
@@ -0,0 +1,38 @@
+import sys
+from maze import Maze
+from main_3a import plan_paths
+from config import DEFAULT_ALGORITHM, SHARED_PATH_COLOR, CELL_SIZE, agent_palette, path_palette
+
+def main():
+    # Check command line arguments
+    if len(sys.argv) < 3:
+        sys.exit("Usage: python export_3a.py maze4_3a.txt|scenario.json output.gif [algorithm]")
+
+    maze_file = sys.argv[1]
+    output = sys.argv[2]
+    algorithm = DEFAULT_ALGORITHM
+    if len(sys.argv) > 3:
+        algorithm = sys.argv[3].lower()
+
+    # The frame rasterizer and GIF/MP4 encoders live in the swarmaze package
+    try:
+        from swarmaze.export import export_agents
+    except ImportError:
+        sys.exit("Error: export needs the swarmaze package (pip install -e ../package[export]).")
+
+    print(f"Loading maze from {maze_file}...")
+    print(f"Using {algorithm.upper()} search algorithm")
+    maze = Maze(maze_file)
+    agent_ids, agent_paths, exploration_traces, _ = plan_paths(maze, algorithm)
+
+    # Render off-screen: no pygame window, so this also runs on display-less machines
+    path_colors = path_palette(agent_ids)
+    agent_colors = agent_palette(agent_ids)
+    frames = export_agents(maze.walls, sorted(set(maze.goals.values())), exploration_traces, agent_paths, output,
+                           trace_colors=[path_colors[agent_id] for agent_id in agent_ids],
+                           agent_colors=[agent_colors[agent_id] for agent_id in agent_ids],
+                           shared_color=SHARED_PATH_COLOR, cell_size=CELL_SIZE // 2)
+    print(f"{frames} frames written to {output}")
+
+if __name__ == "__main__":
+    main()
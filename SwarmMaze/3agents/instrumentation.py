@@ -0,0 +1,66 @@
+import json
+from collections import deque
+
+from swarmaze.instrument import Instrumentation as SearchInstrumentation, HeapProxy, TIMERS as SEARCH_TIMERS
+
+import algorithms
+
+# Timers reported for each search: the swarmaze ones plus reservation table lookups
+TIMERS = SEARCH_TIMERS + ["reservation"]
+
+# Functions of algorithms.py timed as heuristic work (goal_distances is A*'s one-off precomputation)
+HEURISTICS = ["manhattan", "arrival_heuristic", "goal_distances"]
+
+class Instrumentation(SearchInstrumentation):
+    """
+    The swarmaze search instrumentation (swarmaze/instrument.py) applied to one
+    find_path call. While active, maze.neighbors (one call per expansion), the
+    reservation lookups, and the heapq, deque and heuristic names used by
+    algorithms.py are wrapped; everything is restored on exit.
+
+        with Instrumentation(maze, reservation, "astar") as stats:
+            path, exploration = pathfinder.find_path("astar", start, goal, reservation)
+    """
+    timers = TIMERS
+
+    def __init__(self, maze, reservation=None, algorithm=None):
+        super().__init__(None, algorithm)
+        self.maze = maze
+        self.reservation = reservation
+
+    def attach(self):
+        stats = self.stats
+        neighbors = self.timed(self.maze.neighbors, "neighbors")
+
+        def expand(position):
+            # Lookups made while precomputing a heuristic are heuristic work, not expansions
+            if not self.busy:
+                stats.expansions += 1
+            return neighbors(position)
+
+        self.patch(self.maze, "neighbors", expand)
+        if self.reservation is not None:
+            for name in ("is_reserved", "is_move_reserved", "safe_intervals"):
+                self.patch(self.reservation, name, self.timed(getattr(self.reservation, name), "reservation"))
+        for name in HEURISTICS:
+            self.patch(algorithms, name, self.timed(getattr(algorithms, name), "heuristic"))
+        self.patch(algorithms, "heapq", HeapProxy(self))
+        self.patch(algorithms, "deque", self.counting_deque())
+
+    def state_of(self, entry):
+        """(position, time) of a frontier entry: queue entries are the state, heap entries end with it."""
+        return entry[-1] if isinstance(entry[-1], tuple) else entry
+
+    def counting_deque(self):
+        """deque subclass that reports its appends and pops (BFS and bidirectional frontiers)."""
+        class CountingDeque(deque):
+            append = self.frontier_call(deque.append, push=True)
+            pop = self.frontier_call(deque.pop, push=False)
+            popleft = self.frontier_call(deque.popleft, push=False)
+
+        return CountingDeque
+
+def save_stats(stats, filename):
+    """Writes a list of SearchStats (one per agent) as a JSON array."""
+    with open(filename, "w") as f:
+        json.dump([entry.to_dict() for entry in stats], f, indent=2)
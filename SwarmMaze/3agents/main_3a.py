@@ -1,12 +1,69 @@
 import sys
 from maze import Maze, PathFinder, Visualizer
 from reservation import ReservationTable
-from config import DEFAULT_ALGORITHM, PATH_COLORS
+from cbs import ConflictBasedSearch, MULTI_AGENT_ALGORITHMS
+from config import DEFAULT_ALGORITHM
+
+def plan_paths(maze, algorithm):
+    """Plan every agent in priority order; returns (agent_ids, paths, exploration_traces, reservation_table)"""
+    if algorithm in MULTI_AGENT_ALGORITHMS:
+        return plan_paths_cbs(maze, algorithm)
+
+    pathfinder = PathFinder(maze)
+    
+    # Initialize reservation table
+    reservation_table = ReservationTable()
+    
+    # Calculate paths for all agents with collision avoidance
+    agent_paths = []
+    agent_ids = []
+    exploration_traces = []
+    
+    # Plan paths in order (priority by agent ID)
+    for agent_id in sorted(maze.starts):
+        start = maze.starts[agent_id]
+        
+        # Find path using selected algorithm
+        path, exploration = pathfinder.find_path(algorithm, start, maze.goals[agent_id], reservation_table)
+
+        # Update reservation table with this agent's path
+        for t, pos in enumerate(path):
+            reservation_table.add_reservation(pos, t, agent_id)
+        
+        agent_paths.append(path)
+        agent_ids.append(agent_id)
+        exploration_traces.append(exploration)
+        print(f"Agent {agent_id} path length: {len(path)}, explored {len(exploration)} cells")
+    
+    return agent_ids, agent_paths, exploration_traces, reservation_table
+
+def plan_paths_cbs(maze, algorithm):
+    """Plan all agents together with CBS or ECBS; same return value as plan_paths"""
+    solver = ConflictBasedSearch(maze, suboptimality=MULTI_AGENT_ALGORITHMS[algorithm])
+    agent_ids = sorted(maze.starts)
+    result = solver.plan(maze.starts, maze.goals)
+    print(f"{algorithm.upper()} expanded {solver.expanded} of {solver.generated} high-level nodes")
+    if result is None:
+        print(f"{algorithm.upper()} found no conflict-free plan; agents stay at their starts")
+        paths = {agent_id: [maze.starts[agent_id]] for agent_id in agent_ids}
+        traces = dict.fromkeys(agent_ids, [])
+    else:
+        paths, traces = result
+
+    # The same table prioritized planning builds, for display and collision checks
+    reservation_table = ReservationTable()
+    for agent_id in agent_ids:
+        for t, pos in enumerate(paths[agent_id]):
+            reservation_table.add_reservation(pos, t, agent_id)
+        print(f"Agent {agent_id} path length: {len(paths[agent_id])}, explored {len(traces[agent_id])} cells")
+
+    return (agent_ids, [paths[agent_id] for agent_id in agent_ids],
+            [traces[agent_id] for agent_id in agent_ids], reservation_table)
 
 def main():
     # Check command line arguments
     if len(sys.argv) < 2:
-        sys.exit("Usage: python main_3a.py maze4_3a.txt [algorithm]")
+        sys.exit("Usage: python main_3a.py maze4_3a.txt|scenario.json [algorithm]")
     
     # Get maze file from command line
     maze_file = sys.argv[1]
@@ -19,35 +76,11 @@ def main():
     print(f"Loading maze from {maze_file}...")
     print(f"Using {algorithm.upper()} search algorithm")
     
-    # Create maze, pathfinder, and visualizer
+    # Create maze and visualizer
     maze = Maze(maze_file)
-    pathfinder = PathFinder(maze)
     visualizer = Visualizer(maze)
     
-    # Initialize reservation table
-    reservation_table = ReservationTable()
-    
-    # Calculate paths for all agents with collision avoidance
-    agent_paths = []
-    agent_ids = []
-    exploration_traces = []
-    
-    # Plan paths in order (priority by agent ID)
-    for agent_id in range(1, 4):
-        if agent_id in maze.starts:
-            start = maze.starts[agent_id]
-            
-            # Find path using selected algorithm
-            path, exploration = pathfinder.find_path(algorithm, start, maze.goal, reservation_table)
-
-            # Update reservation table with this agent's path
-            for t, pos in enumerate(path):
-                reservation_table.add_reservation(pos, t, agent_id)
-            
-            agent_paths.append(path)
-            agent_ids.append(agent_id)
-            exploration_traces.append(exploration)
-            print(f"Agent {agent_id} path length: {len(path)}, explored {len(exploration)} cells")
+    agent_ids, agent_paths, exploration_traces, reservation_table = plan_paths(maze, algorithm)
     
     # Debugging: Print reservation table
     print("Final Reservation Table:")
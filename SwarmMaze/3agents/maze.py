@@ -1,89 +1,132 @@
+import json
+import os
 import pygame
 import sys
 import heapq
 from collections import deque
-from algorithms import BFS, DFS, AStar, Greedy, Dijkstra, BidirectionalSearch, IterativeDeepeningDFS
+from algorithms import BFS, DFS, AStar, SIPP, Greedy, Dijkstra, BidirectionalSearch, IterativeDeepeningDFS
+from config import (WHITE, BLACK, GREEN, BLUE, SHARED_PATH_COLOR, CELL_SIZE,
+                    agent_palette, path_palette)
 
-# Colors
-WHITE = (255, 255, 255)   # Wall
-BLACK = (0, 0, 0)         # Background
-GREEN = (0, 255, 0)       # Goal
-RED = (255, 0, 0)         # Start
-BLUE = (0, 0, 255)        # Default agent color
-
-# Agent colors
-AGENT_COLORS = {
-    1: (0, 0, 255),       # Blue
-    2: (255, 165, 0),     # Orange
-    3: (128, 0, 128)      # Purple
-}
-
-# Path colors
-PATH_COLORS = {
-    1: (100, 100, 255),   # Light blue
-    2: (255, 200, 100),   # Light orange
-    3: (200, 100, 200)    # Light purple
-}
-
-# Shared path color
-SHARED_PATH_COLOR = (150, 150, 150)  # Gray
-
-# Cell size in pixels
-CELL_SIZE = 30
+# Print (and list in legends) every agent only for mazes with up to this many agents
+LISTED_AGENTS = 10
 
 class Maze:
     """Class to represent and parse a maze from a file"""
     def __init__(self, filename):
-        # Read maze file
-        with open(filename, 'r') as f:
-            lines = f.read().splitlines()
-        
-        # Calculate the width
-        self.height = len(lines)
-        self.width = max(len(line.replace('A1', ' ').replace('A2', ' ').replace('A3', ' ')) for line in lines)
-        
-        # Parse maze structure
+        """
+        :param filename: A maze text file (walls, A<number> starts and a shared goal B),
+        or a .json scenario: {"grid": rows or a maze file, "goal": [row, col],
+        "agents": [{"id": 4, "start": [row, col], "goal": [row, col]}, ...]}.
+        Scenario agents are added to the grid's own; "goal" (per agent or shared)
+        defaults to the grid's B.
+        """
         self.walls = []
         self.starts = {}
-        self.goal = None
+        self.goal = None  # Shared goal of agents without their own
+        self.goals = {}  # agent_id -> goal
+
+        if filename.endswith(".json"):
+            self.load_scenario(filename)
+        else:
+            with open(filename, 'r') as f:
+                self.parse_grid(f.read().splitlines())
+            self.goals = {agent_id: self.goal for agent_id in self.starts}
+
+        for agent_id, goal in self.goals.items():
+            if goal is None:
+                raise Exception(f"Agent {agent_id} has no goal")
         
+        # Print only basic information, not the full maze
+        print(f"Maze loaded: {self.height}x{self.width}")
+        if len(self.starts) <= LISTED_AGENTS:
+            print(f"Start positions: {self.starts}")
+        else:
+            print(f"Agents: {len(self.starts)}")
+        goal_cells = set(self.goals.values()) or {self.goal}
+        if len(goal_cells) == 1:
+            print(f"Goal position: {goal_cells.pop()}")
+        else:
+            print(f"Goal positions: {len(goal_cells)}")
+
+    def parse_grid(self, lines):
+        """Read walls, A<number> start tokens and the goal B from the lines of a maze"""
+        self.height = len(lines)
         for i, line in enumerate(lines):
             row = []
             col_index = 0  # Actual grid column index
             
             j = 0  # Character index in the original line
             while j < len(line):
-                if j < len(line) - 1 and line[j:j+2] in ['A1', 'A2', 'A3']:
-                    agent_num = int(line[j+1])
+                digits = j + 1
+                while digits < len(line) and line[digits].isdigit():
+                    digits += 1
+                if line[j] == 'A' and digits > j + 1:
+                    # Agent token: A followed by its number, one cell wide
+                    agent_num = int(line[j+1:digits])
+                    if agent_num in self.starts:
+                        raise Exception(f"Agent {agent_num} appears twice in the maze")
                     self.starts[agent_num] = (i, col_index)
                     row.append(False)  # Not a wall
-                    j += 2
-                    col_index += 1
-                elif j < len(line) and line[j] == 'B':
+                    j = digits
+                elif line[j] == 'B':
                     self.goal = (i, col_index)
                     row.append(False)  # Not a wall
                     j += 1
-                    col_index += 1
-                elif j < len(line) and line[j] == ' ':
+                elif line[j] == ' ':
                     row.append(False)  # Not a wall
                     j += 1
-                    col_index += 1
                 else:
                     # Any other character is treated as a wall
                     row.append(True)   # Wall
                     j += 1
-                    col_index += 1
-            
-            # Pad row to match width
-            while len(row) < self.width:
-                row.append(False)  # Treat padding as empty spaces
-            
+                col_index += 1
             self.walls.append(row)
-        
-        # Print only basic information, not the full maze
-        print(f"Maze loaded: {self.height}x{self.width}")
-        print(f"Start positions: {self.starts}")
-        print(f"Goal position: {self.goal}")
+
+        # Pad rows to match width
+        self.width = max((len(row) for row in self.walls), default=0)
+        for row in self.walls:
+            row.extend([False] * (self.width - len(row)))  # Treat padding as empty spaces
+
+    def load_scenario(self, filename):
+        """Read a JSON scenario: a grid plus a list of agents with their own start and goal"""
+        with open(filename, 'r') as f:
+            scenario = json.load(f)
+        grid = scenario.get("grid")
+        if isinstance(grid, str):
+            # A maze file, relative to the scenario
+            with open(os.path.join(os.path.dirname(filename), grid), 'r') as f:
+                grid = f.read().splitlines()
+        if not grid:
+            raise Exception(f"Scenario {filename} has no grid")
+        self.parse_grid(grid)
+        if "goal" in scenario:
+            self.goal = self.cell(scenario["goal"], "The shared goal")
+        self.goals = {agent_id: self.goal for agent_id in self.starts}
+
+        # Agents without an id are numbered after the grid's A<number> agents
+        next_id = max(self.starts, default=0) + 1
+        for agent in scenario.get("agents", []):
+            if "id" in agent:
+                agent_id = agent["id"]
+            else:
+                while next_id in self.starts:
+                    next_id += 1
+                agent_id = next_id
+            if agent_id in self.starts:
+                raise Exception(f"Agent {agent_id} is defined twice")
+            self.starts[agent_id] = self.cell(agent["start"], f"Agent {agent_id}'s start")
+            self.goals[agent_id] = self.cell(agent["goal"], f"Agent {agent_id}'s goal") if "goal" in agent else self.goal
+
+        if len(set(self.starts.values())) < len(self.starts):
+            raise Exception("Two agents start in the same cell")
+
+    def cell(self, position, name):
+        """A [row, col] from a scenario as a position, checked to be a free cell of the maze"""
+        position = tuple(position)
+        if len(position) != 2 or not self.is_valid_position(position):
+            raise Exception(f"{name} {list(position)} is a wall or outside the maze")
+        return position
 
     def neighbors(self, position):
         """Returns traversable neighbor positions"""
@@ -120,6 +163,8 @@ class PathFinder:
             return DFS.solve(self.maze, start, goal, reservation)
         elif algorithm == "astar":
             return AStar.solve(self.maze, start, goal, reservation)
+        elif algorithm == "sipp":
+            return SIPP.solve(self.maze, start, goal, reservation)
         elif algorithm == "greedy":
             return Greedy.solve(self.maze, start, goal, reservation)
         elif algorithm == "dijkstra":
@@ -141,6 +186,9 @@ class Visualizer:
         self.screen = pygame.display.set_mode((self.width, self.height))
         pygame.display.set_caption("Multi-Agent Maze Solver")
         self.clock = pygame.time.Clock()
+        self.agent_colors = agent_palette(maze.starts)
+        self.path_colors = path_palette(maze.starts)
+        self.goal_cells = set(maze.goals.values())
     
     def draw_with_paths(self, agent_positions=None, agent_ids=None, paths=None, path_colors=None):
         """Draw the maze with color-coded paths for each agent"""
@@ -152,14 +200,14 @@ class Visualizer:
         
         # Draw agent paths
         if paths and path_colors:
-            for agent_id, path in enumerate(paths):
+            for agent_id, path in zip(agent_ids, paths):
                 for cell in path:
-                    if cell != self.maze.goal and (not agent_positions or cell not in agent_positions):
+                    if cell not in self.goal_cells and (not agent_positions or cell not in agent_positions):
                         if cell in path_grid:
                             # If multiple agents use this cell, use shared color
-                            path_grid[cell] = 0  # 0 means shared
+                            path_grid[cell] = None  # None means shared
                         else:
-                            path_grid[cell] = agent_id + 1  # Store agent_id
+                            path_grid[cell] = agent_id  # Store agent_id
         
         # Draw path cells with appropriate colors
         for cell, agent_id in path_grid.items():
@@ -167,7 +215,7 @@ class Visualizer:
             y = cell[0] * CELL_SIZE
             rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
             
-            if agent_id == 0:  # Shared path
+            if agent_id is None:  # Shared path
                 pygame.draw.rect(self.screen, SHARED_PATH_COLOR, rect)
             else:
                 color = path_colors.get(agent_id, BLUE)
@@ -184,8 +232,8 @@ class Visualizer:
                 if self.maze.walls[i][j]:
                     pygame.draw.rect(self.screen, WHITE, rect)
                 
-                # Draw goal
-                elif self.maze.goal and (i, j) == self.maze.goal:
+                # Draw goals
+                elif (i, j) in self.goal_cells:
                     pygame.draw.rect(self.screen, GREEN, rect)
                 
                 # Draw grid lines
@@ -197,7 +245,7 @@ class Visualizer:
                 x = pos[1] * CELL_SIZE
                 y = pos[0] * CELL_SIZE
                 rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
-                color = AGENT_COLORS.get(agent_id, BLUE)
+                color = self.agent_colors.get(agent_id, BLUE)
                 pygame.draw.rect(self.screen, color, rect)
         
         # Update display
@@ -229,8 +277,8 @@ class Visualizer:
                         current_paths[i].append(cell)
             
             # Display current state
-            agent_positions = [path[0] for path in current_paths if path]  # Start positions
-            self.draw_with_paths(agent_positions, agent_ids, current_paths, PATH_COLORS)
+            agent_positions = [self.maze.starts[agent_id] for agent_id in agent_ids]  # Start positions
+            self.draw_with_paths(agent_positions, agent_ids, current_paths, self.path_colors)
             
             # Control frame rate
             clock.tick(30)
@@ -241,7 +289,7 @@ class Visualizer:
         
         # Then, animate agents following their final paths
         if running:
-            self.animate_paths_smooth(final_paths, agent_ids, PATH_COLORS, animation_frames=8)
+            self.animate_paths_smooth(final_paths, agent_ids, self.path_colors, animation_frames=8)
         else:
             pygame.quit()
     
@@ -1,51 +1,103 @@
 import sys
 from maze import Maze, PathFinder
 from reservation import ReservationTable
+from cbs import ConflictBasedSearch, MULTI_AGENT_ALGORITHMS
 
 class PerformanceMetrics:
     """Class to calculate performance metrics for multi-agent pathfinding."""
-    def __init__(self, maze, algorithm):
+    def __init__(self, maze, algorithm, instrument=False):
         self.maze = maze
         self.algorithm = algorithm
         self.pathfinder = PathFinder(maze)
         self.reservation = ReservationTable()
+        self.instrument = instrument  # Also count and time the search work (see instrumentation.py)
+        if instrument:
+            # The counters and timers come from the swarmaze package
+            from instrumentation import Instrumentation
+            self.instrumentation = Instrumentation
+        self.search_stats = []
+        self.high_level_nodes = None  # CBS/ECBS only: high-level nodes expanded by measure()
 
     def measure(self):
         """Measure performance metrics for all agents."""
+        if self.algorithm in MULTI_AGENT_ALGORITHMS:
+            return self.measure_cbs()
+
         agent_metrics = []
-        for agent_id, start in self.maze.starts.items():
+        for agent_id, start in sorted(self.maze.starts.items()):
             # Find path using the specified algorithm
-            path, exploration = self.pathfinder.find_path(self.algorithm, start, self.maze.goal, self.reservation)
+            if self.instrument:
+                with self.instrumentation(self.maze, self.reservation, self.algorithm) as stats:
+                    path, exploration = self.pathfinder.find_path(self.algorithm, start, self.maze.goals[agent_id], self.reservation)
+                self.search_stats.append(stats)
+            else:
+                path, exploration = self.pathfinder.find_path(self.algorithm, start, self.maze.goals[agent_id], self.reservation)
 
             # Update reservation table with the agent's path
             for t, pos in enumerate(path):
                 self.reservation.add_reservation(pos, t, agent_id)
 
             # Collect metrics for the agent
+            metric = {
+                "agent_id": agent_id,
+                "path_length": len(path),
+                "explored_cells": len(exploration),
+            }
+            if self.instrument:
+                metric.update(stats.to_dict())
+            agent_metrics.append(metric)
+
+        return agent_metrics
+
+    def measure_cbs(self):
+        """
+        Measure a joint CBS/ECBS plan. Explored cells are those of the low-level search
+        that produced each agent's final path; with instrumentation one SearchStats
+        covers the whole plan, every low-level search included.
+        """
+        solver = ConflictBasedSearch(self.maze, suboptimality=MULTI_AGENT_ALGORITHMS[self.algorithm])
+        if self.instrument:
+            with self.instrumentation(self.maze, None, self.algorithm) as stats:
+                result = solver.plan(self.maze.starts, self.maze.goals)
+            self.search_stats.append(stats)
+        else:
+            result = solver.plan(self.maze.starts, self.maze.goals)
+        self.high_level_nodes = solver.expanded
+
+        agent_metrics = []
+        for agent_id, start in sorted(self.maze.starts.items()):
+            path, exploration = (result[0][agent_id], result[1][agent_id]) if result else ([start], [])
             agent_metrics.append({
                 "agent_id": agent_id,
                 "path_length": len(path),
                 "explored_cells": len(exploration),
             })
-
         return agent_metrics
 
 def main():
     # Check command line arguments
     if len(sys.argv) < 3:
-        sys.exit("Usage: python performance_metrics.py maze_file algorithm")
+        sys.exit("Usage: python performance_metrics.py maze_file algorithm [stats.json]")
 
     maze_file = sys.argv[1]
     algorithm = sys.argv[2].lower()
+    stats_file = sys.argv[3] if len(sys.argv) > 3 else None
 
     print(f"Loading maze from {maze_file}...")
     print(f"Using {algorithm.upper()} search algorithm")
 
+    # Search instrumentation reuses the swarmaze package's counters
+    if stats_file:
+        try:
+            from instrumentation import save_stats
+        except ImportError:
+            sys.exit("Error: search stats need the swarmaze package (pip install -e ../package).")
+
     # Load the maze
     maze = Maze(maze_file)
 
     # Calculate performance metrics
-    metrics_calculator = PerformanceMetrics(maze, algorithm)
+    metrics_calculator = PerformanceMetrics(maze, algorithm, instrument=stats_file is not None)
     metrics = metrics_calculator.measure()
 
     # Print performance metrics
@@ -59,6 +111,13 @@ def main():
     for metric in metrics:
         print(f"{metric['agent_id']:>5} {metric['path_length']:>15} {metric['explored_cells']:>15}")
     print("==================================================")
+    if algorithm in MULTI_AGENT_ALGORITHMS:
+        print(f"High-level nodes expanded: {metrics_calculator.high_level_nodes}")
+
+    # Search instrumentation: per-agent counters and timers as JSON
+    if stats_file:
+        save_stats(metrics_calculator.search_stats, stats_file)
+        print(f"Search stats written to {stats_file}")
 
 if __name__ == "__main__":
     main()
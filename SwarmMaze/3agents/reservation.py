@@ -1,16 +1,50 @@
+import bisect
+import math
+
 class ReservationTable:
     """Class to manage time-based reservations for collision avoidance."""
     def __init__(self):
         self.reservations = {}
+        self.times = {}  # position -> sorted reserved time steps, for safe intervals
+        self.moves = {}  # (position, next position, time) -> agent ID; that move between time and time + 1 is forbidden
+        self.last_time = -1  # Latest reserved time step; nothing is reserved after it
 
     def add_reservation(self, position, time, agent_id):
         """Add a reservation for a specific position and time."""
+        if (position, time) not in self.reservations:
+            bisect.insort(self.times.setdefault(position, []), time)
         self.reservations[(position, time)] = agent_id
+        if time > self.last_time:
+            self.last_time = time
+
+    def add_move_reservation(self, position, neighbor, time, agent_id):
+        """Forbid the move from position to neighbor between time and time + 1 (a swap with agent_id)."""
+        self.moves[(position, neighbor, time)] = agent_id
+        if time > self.last_time:
+            self.last_time = time
+
+    def safe_intervals(self, position):
+        """
+        Maximal (first, last) time ranges during which a position is free, in order.
+        The last interval is open-ended: its end is math.inf.
+        """
+        intervals = []
+        first = 0
+        for time in self.times.get(position, ()):
+            if time > first:
+                intervals.append((first, time - 1))
+            first = time + 1
+        intervals.append((first, math.inf))
+        return intervals
 
     def is_reserved(self, position, time):
         """Check if a position is reserved at a specific time."""
         return (position, time) in self.reservations
 
+    def is_move_reserved(self, position, neighbor, time):
+        """Check if the move from position to neighbor between time and time + 1 is forbidden."""
+        return (position, neighbor, time) in self.moves
+
     def get_reservation(self, position, time):
         """Get the agent ID that reserved a position at a specific time."""
         return self.reservations.get((position, time), None)
@@ -1,16 +1,48 @@
 import json
-import numpy as np
-from shapely.geometry import shape, Point
 import sys
 
-def generate_maze(geojson_file, output_file, grid_size=50):
+# NumPy and shapely are imported where they are used, so importing this
+# module (e.g. for proximity_costs) does not pay for shapely
+
+def proximity_costs(walls, radius):
+    """
+    Terrain costs that grow near buildings: a free cell at grid distance d
+    (4-connected) from the nearest wall costs 2 + radius - d for d <= radius,
+    and 1 further away. Costs are capped at 9 to fit the terrain maze format.
+
+    :param walls: 2D bool array, True for building cells.
+    :param radius: Distance (in cells) over which buildings raise the cost.
+    :return: 2D int array of costs.
+    """
+    import numpy as np
+
+    costs = np.ones(walls.shape, dtype=int)
+    near = walls.copy()
+    for d in range(1, radius + 1):
+        # Grow the building mask by one cell in each direction
+        grown = near.copy()
+        grown[1:, :] |= near[:-1, :]
+        grown[:-1, :] |= near[1:, :]
+        grown[:, 1:] |= near[:, :-1]
+        grown[:, :-1] |= near[:, 1:]
+        costs[grown & ~near] = min(9, 2 + radius - d)
+        near = grown
+    return costs
+
+
+def generate_maze(geojson_file, output_file, grid_size=50, proximity=0):
     """
     Generates a maze from a GeoJSON file containing building data.
 
     :param geojson_file: Path to the GeoJSON file with building data.
     :param output_file: Path to save the generated maze file.
     :param grid_size: Number of rows and columns in the grid.
+    :param proximity: If > 0, write a terrain maze where free cells within this
+                      many cells of a building get digit costs (see proximity_costs).
     """
+    import numpy as np
+    from shapely.geometry import shape, Point
+
     # Load the GeoJSON file
     with open(geojson_file, "r") as f:
         data = json.load(f)
@@ -40,6 +72,15 @@ def generate_maze(geojson_file, output_file, grid_size=50):
                     if building.contains(point):
                         maze[i][j] = "#"
 
+    # Weight free cells by how close they are to buildings
+    if proximity > 0:
+        walls = np.array([[cell == "#" for cell in row] for row in maze])
+        costs = proximity_costs(walls, proximity)
+        for i in range(grid_size):
+            for j in range(grid_size):
+                if not walls[i, j] and costs[i, j] > 1:
+                    maze[i][j] = str(costs[i, j])
+
     # Add start (A) and goal (B) points
     maze[1][1] = "A"  # Top-left corner
     maze[-2][-2] = "B"  # Bottom-right corner
@@ -55,12 +96,13 @@ def generate_maze(geojson_file, output_file, grid_size=50):
 if __name__ == "__main__":
     # Check if the user provided the GeoJSON file name
     if len(sys.argv) < 2:
-        print("Usage: python generate_maze.py <geojson_file>")
+        print("Usage: python generate_maze.py <geojson_file> [proximity]")
         sys.exit(1)
 
     # Input GeoJSON file and output maze file
     geojson_file = sys.argv[1]  # GeoJSON file provided as a command-line argument
     output_file = "maze4.txt"  # Path to save the maze file
+    proximity = int(sys.argv[2]) if len(sys.argv) > 2 else 0  # Terrain cost radius around buildings
 
     # Generate the maze
-    generate_maze(geojson_file, output_file)
\ No newline at end of file
+    generate_maze(geojson_file, output_file, proximity=proximity)
\ No newline at end of file
@@ -27,10 +27,22 @@ setuptools.setup(
         "pygame",
         # Other dependencies if needed
     ],
+    extras_require={
+        # Compact NumPy grid backend (swarmaze.grid)
+        "grid": ["numpy"],
+        # GIF/MP4 export of search runs (swarmaze.export); GIF needs only numpy
+        "export": ["numpy", "imageio", "imageio-ffmpeg"],
+    },
     entry_points={
         "console_scripts": [
             # This will let users do: `swarmaze maze.txt [algorithm]`
-            "swarmaze = swarmaze.main:main"
+            "swarmaze = swarmaze.main:main",
+            # Headless benchmark over a directory of mazes: `swarmaze-bench mazes/ --csv results.csv`
+            "swarmaze-bench = swarmaze.benchmark:main",
+            # Precompute goal distance fields / path databases: `swarmaze-precompute maze.txt maze.dist`
+            "swarmaze-precompute = swarmaze.precompute:main",
+            # Render a search to an animation: `swarmaze-export maze.txt run.gif --algorithm astar`
+            "swarmaze-export = swarmaze.export:main",
         ]
     },
 )
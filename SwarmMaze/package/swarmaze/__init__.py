@@ -1,4 +1,34 @@
 # swarmaze/__init__.py
 """
 swarmaze: A pathfinding visualizer for 2D mazes using Pygame.
+
+Names below are imported on first use, so `import swarmaze` stays cheap:
+pygame is only loaded for Visualizer and NumPy only for the grid backend.
 """
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "Maze": "maze",
+    "Node": "maze",
+    "GridMaze": "grid",
+    "Visualizer": "visualizer",
+    "NullVisualizer": "headless",
+    "RecordingVisualizer": "headless",
+    "ALGORITHMS": "main",
+    "Instrumentation": "instrument",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = value  # later lookups skip __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,27 +1,87 @@
-from .maze import Node, StackFrontier, QueueFrontier
-from .visualizer import Visualizer
+from .maze import Node, StackFrontier, QueueFrontier, DIAGONAL_MOVES
+from collections.abc import Set
+from array import array
 import heapq
+import itertools
+import math
 import random
 
 
+# Unit moves of the 4-connected grid, keyed by direction
+DIRECTIONS = {(-1, 0): "up", (1, 0): "down", (0, -1): "left", (0, 1): "right"}
+
+# Every move of the 8-connected grid, keyed by direction
+ACTIONS = {**DIRECTIONS, **{(dr, dc): action for action, dr, dc in DIAGONAL_MOVES}}
+
+# Cost of a diagonal step
+SQRT2 = math.sqrt(2)
+
+
+def grid_distance(dr, dc, connectivity=4):
+    """
+    Shortest move distance for a row/col offset on an open grid: Manhattan on
+    4-connected mazes, octile (diagonal steps cost sqrt(2)) on 8-connected ones.
+    """
+    dr, dc = abs(dr), abs(dc)
+    if connectivity == 8:
+        return max(dr, dc) + (SQRT2 - 1) * min(dr, dc)
+    return dr + dc
+
+
+def goal_entry(maze, min_cost, connectivity):
+    """
+    (cost of entering the goal, length of the last step) for terrain heuristics.
+    Every path ends with one step into the goal, straight or, on 8-connected
+    mazes, diagonal; the length taken is whichever gives the smaller bound.
+    """
+    costs = getattr(maze, "costs", None)
+    cost = 1 if costs is None else costs[maze.goal[0] * maze.width + maze.goal[1]]
+    step = SQRT2 if connectivity == 8 and cost < min_cost else 1
+    return cost, step
+
+
 class PriorityQueueFrontier():
     def __init__(self):
-        self.frontier = []
+        self.frontier = []  # heap of (f, heuristic, sequence, node) entries
+        self.best = {}      # state -> the live node queued for that state
+        self.counter = itertools.count()
 
     def add(self, node):
-        heapq.heappush(self.frontier, node)
+        """
+        Queues a node. If the state is already queued, the cheaper node wins and
+        the other one is left in the heap as a stale entry (lazy deletion).
+        Entries are tuples, so heap comparisons never call back into Python:
+        f ties go to the node closer to the goal, then to the oldest entry.
+        """
+        current = self.best.get(node.state)
+        if current is not None and node.f >= current.f:
+            return
+        self.best[node.state] = node
+        heapq.heappush(self.frontier, (node.f, node.heuristic, next(self.counter), node))
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+        return state in self.best
+
+    def get(self, state):
+        return self.best.get(state)
 
     def empty(self):
-        return len(self.frontier) == 0
+        return len(self.best) == 0
+
+    def __len__(self):
+        return len(self.best)
 
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")
-        else:
-            return heapq.heappop(self.frontier)
+        while True:
+            node = heapq.heappop(self.frontier)[3]
+            # Skip entries superseded by a cheaper node for the same state
+            if self.best.get(node.state) is node:
+                del self.best[node.state]
+                if not self.best:
+                    self.frontier.clear()
+                return node
 
 
 class DFS():
@@ -106,19 +166,32 @@ class AStar():
         self.visualizer = visualizer
         self.frontier = PriorityQueueFrontier()
         self.explored = set()
+        # Terrain mazes carry a flat table of per-cell costs; plain mazes cost 1 per step
+        self.costs = getattr(maze, "costs", None)
+        self.min_cost = getattr(maze, "min_cost", 1)
+        self.connectivity = getattr(maze, "connectivity", 4)
+        self.goal_cost, self.last_step = goal_entry(maze, self.min_cost, self.connectivity)
 
     def heuristic(self, state):
         """
-        Heuristic function: Manhattan distance from the current state to the goal.
+        Heuristic function: Manhattan distance from the current state to the goal
+        (octile distance on 8-connected mazes). On terrain the step into the goal
+        costs the goal's own cost and every other step at least the cheapest cell
+        cost, so it stays admissible.
         """
         x1, y1 = state
         x2, y2 = self.maze.goal
-        return abs(x1 - x2) + abs(y1 - y2)
+        distance = grid_distance(x1 - x2, y1 - y2, self.connectivity)
+        if not distance:
+            return 0
+        return self.goal_cost * self.last_step + self.min_cost * (distance - self.last_step)
 
     def solve(self):
         start = Node(state=self.maze.start, parent=None, action=None, cost=0, heuristic=self.heuristic(self.maze.start))
         self.frontier.add(start)
 
+        costs, width = self.costs, self.maze.width
+        diagonal = self.connectivity == 8
         while not self.frontier.empty():
             node = self.frontier.remove()
 
@@ -139,8 +212,13 @@ class AStar():
             self.explored.add(node.state)
 
             for action, state in self.maze.neighbors(node.state):
-                if not self.frontier.contains_state(state) and state not in self.explored:
-                    cost = node.cost + 1  # Increment cost by 1 for each step
+                # A state already queued keeps whichever node is cheaper
+                if state not in self.explored:
+                    # Cost of entering the neighbor: 1, or its entry in the terrain table
+                    step = 1 if costs is None else costs[state[0] * width + state[1]]
+                    if diagonal and state[0] != node.state[0] and state[1] != node.state[1]:
+                        step *= SQRT2
+                    cost = node.cost + step
                     heuristic = self.heuristic(state)
                     child = Node(state=state, parent=node, action=action, cost=cost, heuristic=heuristic)
                     self.frontier.add(child)
@@ -148,18 +226,144 @@ class AStar():
         raise Exception("No solution")
 
 
+class CellSet(Set):
+    def __init__(self, flags, width):
+        """
+        Read-only set of (row, col) cells over a bytearray of per-cell-id flags,
+        so array-based solvers can hand `explored` to a visualizer without
+        keeping a set of tuples.
+        """
+        self.flags = flags
+        self.width = width
+        self.count = 0
+
+    def add(self, index):
+        """Sets the flag of a flat cell id."""
+        if not self.flags[index]:
+            self.flags[index] = 1
+            self.count += 1
+
+    @classmethod
+    def _from_iterable(cls, iterable):
+        # Results of set operations (explored ^ seen, ...) are plain sets
+        return set(iterable)
+
+    def __contains__(self, cell):
+        try:
+            row, col = cell
+        except (TypeError, ValueError):
+            return False
+        index = row * self.width + col
+        return 0 <= col < self.width and 0 <= index < len(self.flags) and self.flags[index] == 1
+
+    def __iter__(self):
+        for index, flag in enumerate(self.flags):
+            if flag:
+                yield divmod(index, self.width)
+
+    def __len__(self):
+        return self.count
+
+
+class FlatAStar():
+    def __init__(self, maze, visualizer):
+        """
+        A* over flat cell ids (row * width + col) with parallel arrays for the
+        cost and parent of every cell and (f, h, cell) tuples on the heap, so no
+        node object is created per push. Same paths as AStar, a fraction of its
+        memory on large searches; fastest on a GridMaze (neighbor_ids).
+        """
+        self.maze = maze
+        self.visualizer = visualizer
+        size = maze.height * maze.width
+        self.connectivity = getattr(maze, "connectivity", 4)
+        self.frontier = []  # heap of (f, h, cell); entries whose cost changed are skipped
+        # Integer costs, except on 8-connected mazes where diagonals cost sqrt(2)
+        self.cost = array("d" if self.connectivity == 8 else "i", [-1]) * size
+        self.parent = array("i", [-1]) * size
+        self.explored = CellSet(bytearray(size), maze.width)
+        self.costs = getattr(maze, "costs", None)  # already indexed by cell id
+        self.min_cost = getattr(maze, "min_cost", 1)
+        self.goal_cost, self.last_step = goal_entry(maze, self.min_cost, self.connectivity)
+
+    def heuristic(self, index):
+        """
+        Heuristic function: Manhattan (or octile) distance from a cell id to the
+        goal, with terrain costs bounded as in AStar.heuristic.
+        """
+        row, col = divmod(index, self.maze.width)
+        distance = grid_distance(row - self.maze.goal[0], col - self.maze.goal[1], self.connectivity)
+        if not distance:
+            return 0
+        return self.goal_cost * self.last_step + self.min_cost * (distance - self.last_step)
+
+    def neighbor_ids(self, index):
+        if hasattr(self.maze, "neighbor_ids"):
+            return self.maze.neighbor_ids(index)
+        width = self.maze.width
+        return [r * width + c for _, (r, c) in self.maze.neighbors(divmod(index, width))]
+
+    def solve(self):
+        width = self.maze.width
+        start = self.maze.start[0] * width + self.maze.start[1]
+        goal = self.maze.goal[0] * width + self.maze.goal[1]
+        cost, parent, closed, costs = self.cost, self.parent, self.explored.flags, self.costs
+        diagonal = self.connectivity == 8
+
+        cost[start] = 0
+        heapq.heappush(self.frontier, (self.heuristic(start), self.heuristic(start), start))
+        while self.frontier:
+            f, h, cell = heapq.heappop(self.frontier)
+            if closed[cell] or f != cost[cell] + h:
+                continue
+
+            # Visualize the current state
+            self.visualizer.draw_maze(agent_position=divmod(cell, width), explored=self.explored)
+
+            if cell == goal:
+                return self.reconstruct_path(cell)
+
+            self.explored.add(cell)
+
+            for neighbor in self.neighbor_ids(cell):
+                step = 1 if costs is None else costs[neighbor]
+                if diagonal and neighbor // width != cell // width and neighbor % width != cell % width:
+                    step *= SQRT2
+                g = cost[cell] + step
+                if not closed[neighbor] and (cost[neighbor] < 0 or g < cost[neighbor]):
+                    cost[neighbor] = g
+                    parent[neighbor] = cell
+                    h = self.heuristic(neighbor)
+                    heapq.heappush(self.frontier, (g + h, h, neighbor))
+
+        raise Exception("No solution")
+
+    def reconstruct_path(self, cell):
+        width = self.maze.width
+        cells = []
+        while self.parent[cell] >= 0:
+            cells.append(divmod(cell, width))
+            cell = self.parent[cell]
+        cells.reverse()
+        return path_actions(self.maze.start, cells), cells
+
+
 class Dijkstra():
     def __init__(self, maze, visualizer):
         self.maze = maze
         self.visualizer = visualizer
         self.frontier = PriorityQueueFrontier()
         self.explored = set()
+        self.costs = getattr(maze, "costs", None)  # flat per-cell costs of a terrain maze
+        self.connectivity = getattr(maze, "connectivity", 4)
 
     def solve(self):
         # Start node with cost 0
         start = Node(state=self.maze.start, parent=None, action=None, cost=0)
         self.frontier.add(start)
 
+        costs, width = self.costs, self.maze.width
+        diagonal = self.connectivity == 8
         while not self.frontier.empty():
             # Remove the node with the lowest cost
             node = self.frontier.remove()
@@ -182,10 +386,13 @@ class Dijkstra():
             # Mark the node as explored
             self.explored.add(node.state)
 
-            # Add neighbors to the frontier
+            # Add neighbors to the frontier; a state already queued keeps whichever node is cheaper
             for action, state in self.maze.neighbors(node.state):
-                if not self.frontier.contains_state(state) and state not in self.explored:
-                    cost = node.cost + 1  # Increment cost by 1 for each step
+                if state not in self.explored:
+                    step = 1 if costs is None else costs[state[0] * width + state[1]]
+                    if diagonal and state[0] != node.state[0] and state[1] != node.state[1]:
+                        step *= SQRT2
+                    cost = node.cost + step
                     child = Node(state=state, parent=node, action=action, cost=cost)
                     self.frontier.add(child)
 
@@ -277,88 +484,332 @@ class RandomWalk():
 
 class BidirectionalSearch():
     def __init__(self, maze, visualizer):
+        """
+        Bidirectional BFS. The smaller frontier is expanded one whole layer at a
+        time; once the two searches touch, the rest of that layer is finished so
+        the shortest meeting point wins, and both halves are stitched together.
+        """
         self.maze = maze
         self.visualizer = visualizer
         self.frontier_start = QueueFrontier()
         self.frontier_goal = QueueFrontier()
         self.explored_start = set()
         self.explored_goal = set()
+        self.reached_start = {}  # state -> Node of the start tree
+        self.reached_goal = {}   # state -> Node of the goal tree
 
     def solve(self):
-        start = Node(state=self.maze.start, parent=None, action=None)
-        goal = Node(state=self.maze.goal, parent=None, action=None)
+        start = Node(state=self.maze.start, parent=None, action=None, cost=0)
+        goal = Node(state=self.maze.goal, parent=None, action=None, cost=0)
+        if start.state == goal.state:
+            return [], []
         self.frontier_start.add(start)
         self.frontier_goal.add(goal)
+        self.reached_start[start.state] = start
+        self.reached_goal[goal.state] = goal
 
         while not self.frontier_start.empty() and not self.frontier_goal.empty():
-            # Expand from the start
-            node_start = self.frontier_start.remove()
-            self.visualizer.draw_maze(agent_position=node_start.state, explored=self.explored_start)
-            self.explored_start.add(node_start.state)
-
-            # Check if the two searches meet
-            if node_start.state in self.explored_goal:
-                return self.reconstruct_path(node_start, self.explored_goal)
-
-            for action, state in self.maze.neighbors(node_start.state):
-                if state not in self.explored_start:
-                    child = Node(state=state, parent=node_start, action=action)
-                    self.frontier_start.add(child)
-
-            # Expand from the goal
-            node_goal = self.frontier_goal.remove()
-            self.visualizer.draw_maze(agent_position=node_goal.state, explored=self.explored_goal)
-            self.explored_goal.add(node_goal.state)
-
-            # Check if the two searches meet
-            if node_goal.state in self.explored_start:
-                return self.reconstruct_path(node_goal, self.explored_start)
-
-            for action, state in self.maze.neighbors(node_goal.state):
-                if state not in self.explored_goal:
-                    child = Node(state=state, parent=node_goal, action=action)
-                    self.frontier_goal.add(child)
+            if len(self.frontier_start) <= len(self.frontier_goal):
+                meeting = self.expand_layer(self.frontier_start, self.explored_start, self.reached_start, self.reached_goal)
+            else:
+                meeting = self.expand_layer(self.frontier_goal, self.explored_goal, self.reached_goal, self.reached_start)
+            if meeting is not None:
+                return self.reconstruct_path(meeting)
 
         raise Exception("No solution")
 
-    def reconstruct_path(self, node, explored):
-        actions = []
+    def expand_layer(self, frontier, explored, reached, reached_other):
+        """
+        Expands every node currently in the frontier (one BFS layer).
+        :return: The best meeting state found in this layer, or None.
+        """
+        best = None
+        best_cost = float("inf")
+        for _ in range(len(frontier)):
+            node = frontier.remove()
+
+            # Visualize the current state
+            self.visualizer.draw_maze(agent_position=node.state, explored=explored)
+            explored.add(node.state)
+
+            for action, state in self.maze.neighbors(node.state):
+                if state in reached:
+                    continue
+                child = Node(state=state, parent=node, action=action, cost=node.cost + 1)
+                reached[state] = child
+                frontier.add(child)
+                other = reached_other.get(state)
+                if other is not None and child.cost + other.cost < best_cost:
+                    best, best_cost = state, child.cost + other.cost
+        return best
+
+    def reconstruct_path(self, meeting):
+        """Joins the start tree path to the meeting state with the goal tree path from it."""
         cells = []
+        node = self.reached_start[meeting]
         while node.parent is not None:
-            actions.append(node.action)
             cells.append(node.state)
             node = node.parent
-        actions.reverse()
         cells.reverse()
-        return actions, cells
+        node = self.reached_goal[meeting].parent
+        while node is not None:
+            cells.append(node.state)
+            node = node.parent
+        return path_actions(self.maze.start, cells), cells
+
+
+class BidirectionalAStar():
+    def __init__(self, maze, visualizer):
+        """
+        Bidirectional A* (NBA*): one A* from the start towards the goal and one
+        from the goal towards the start, each with its own g-map and parent map.
+        mu is the cost of the best path through a state reached from both sides;
+        the search stops once mu <= max(smallest f in either frontier). A state
+        closed by either side is never expanded again, and a popped state whose
+        bounds already reach mu is closed without expanding it.
+        On 8-connected mazes diagonal steps cost sqrt(2) and the heuristic is octile.
+        """
+        self.maze = maze
+        self.visualizer = visualizer
+        self.connectivity = getattr(maze, "connectivity", 4)
+        self.frontier_start = []  # heaps of (f, -g, state): deeper states win f ties; outdated entries are skipped
+        self.frontier_goal = []
+        self.g_start = {}
+        self.g_goal = {}
+        self.parent_start = {}
+        self.parent_goal = {}
+        self.explored_start = set()
+        self.explored_goal = set()
+        self.closed = set()  # states expanded or rejected by either side
+
+    def heuristic(self, a, b):
+        """
+        Heuristic function: Manhattan (octile on 8-connected mazes) distance between two states.
+        """
+        return grid_distance(a[0] - b[0], a[1] - b[1], self.connectivity)
+
+    def top(self, frontier, g):
+        """Smallest f in a frontier, after dropping outdated entries."""
+        while frontier and (frontier[0][2] in self.closed or -frontier[0][1] != g[frontier[0][2]]):
+            heapq.heappop(frontier)
+        return frontier[0][0] if frontier else float("inf")
+
+    def solve(self):
+        start, goal = self.maze.start, self.maze.goal
+        if start == goal:
+            return [], []
+        # Side 0 searches from the start towards the goal, side 1 the other way
+        sides = (
+            (self.frontier_start, self.g_start, self.parent_start, self.explored_start, goal),
+            (self.frontier_goal, self.g_goal, self.parent_goal, self.explored_goal, start),
+        )
+        for (frontier, g, parent, _, target), source in zip(sides, (start, goal)):
+            g[source] = 0
+            parent[source] = None
+            heapq.heappush(frontier, (self.heuristic(source, target), 0, source))
+
+        mu = float("inf")
+        meeting = None
+        diagonal = self.connectivity == 8
+        while True:
+            f_top = (self.top(self.frontier_start, self.g_start), self.top(self.frontier_goal, self.g_goal))
+            if mu <= max(f_top):
+                break
+
+            # Expand the side with the smaller frontier
+            side = 0 if len(self.frontier_start) <= len(self.frontier_goal) else 1
+            frontier, g, parent, explored, target = sides[side]
+            g_other, other_target = sides[1 - side][1], sides[1 - side][4]
+            _, cost, state = heapq.heappop(frontier)
+            cost = -cost
+            self.closed.add(state)
+
+            # Reject states that cannot lie on a path shorter than mu
+            if (cost + self.heuristic(state, target) >= mu
+                    or cost + f_top[1 - side] - self.heuristic(state, other_target) >= mu):
+                continue
+
+            # Visualize the current state
+            self.visualizer.draw_maze(agent_position=state, explored=explored)
+            explored.add(state)
+
+            for _, neighbor in self.maze.neighbors(state):
+                new_cost = cost + (SQRT2 if diagonal and neighbor[0] != state[0] and neighbor[1] != state[1] else 1)
+                if neighbor not in self.closed and new_cost < g.get(neighbor, float("inf")):
+                    g[neighbor] = new_cost
+                    parent[neighbor] = state
+                    heapq.heappush(frontier, (new_cost + self.heuristic(neighbor, target), -new_cost, neighbor))
+                    if neighbor in g_other and new_cost + g_other[neighbor] < mu:
+                        mu = new_cost + g_other[neighbor]
+                        meeting = neighbor
+
+        if meeting is None:
+            raise Exception("No solution")
+        return self.reconstruct_path(meeting)
+
+    def reconstruct_path(self, meeting):
+        """Joins the start-side parents up to the meeting state with the goal-side parents after it."""
+        cells = []
+        state = meeting
+        while state != self.maze.start:
+            cells.append(state)
+            state = self.parent_start[state]
+        cells.reverse()
+        state = self.parent_goal[meeting]
+        while state is not None:
+            cells.append(state)
+            state = self.parent_goal[state]
+        return path_actions(self.maze.start, cells), cells
+
+
+def path_cost(maze, cells):
+    """
+    Cost of walking from maze.start along a list of adjacent cells, charged like
+    the terrain solvers: each cell's cost (1 on plain mazes), times sqrt(2) for a
+    diagonal step.
+    """
+    costs = getattr(maze, "costs", None)
+    total = 0
+    previous = maze.start
+    for row, col in cells:
+        step = 1 if costs is None else costs[row * maze.width + col]
+        if row != previous[0] and col != previous[1]:
+            step *= SQRT2
+        total += step
+        previous = (row, col)
+    return total
+
+
+def path_actions(start, cells):
+    """Actions that walk from start along a list of adjacent cells."""
+    actions = []
+    previous = start
+    for cell in cells:
+        actions.append(ACTIONS[(cell[0] - previous[0], cell[1] - previous[1])])
+        previous = cell
+    return actions
 
 
 class IterativeDeepeningDFS():
     def __init__(self, maze, visualizer):
+        """
+        Iterative deepening DFS with an explicit stack. Each iteration is a
+        depth-limited DFS that skips states already on the current path and
+        states this iteration already reached at the same or a smaller depth
+        (transposition table), so loops in the maze cannot blow it up.
+        Expansions per iteration are recorded in iteration_nodes.
+        """
         self.maze = maze
         self.visualizer = visualizer
+        self.explored = set()
+        self.iteration_nodes = []
+
+    def bound(self, state, depth):
+        """Value compared against the iteration limit: the depth itself for IDDFS."""
+        return depth
+
+    def step(self, state, following):
+        """Depth added by one move: every move counts as one for IDDFS."""
+        return 1
 
     def solve(self):
-        depth = 0
+        start = self.maze.start
+        self.visualizer.draw_maze(agent_position=start, explored=self.explored)
+        if start == self.maze.goal:
+            return [], []
+
+        limit = self.bound(start, 0)
         while True:
-            try:
-                return self.depth_limited_search(self.maze.start, depth)
-            except Exception:
-                depth += 1
-
-    def depth_limited_search(self, state, depth):
-        if depth == 0:
-            if state == self.maze.goal:
-                return [], [state]
+            result, next_limit = self.depth_limited_search(limit)
+            if result is not None:
+                return result
+            # Nothing was cut off by the limit: the whole reachable maze was searched
+            if next_limit == float("inf"):
+                raise Exception("No solution")
+            limit = next_limit
+
+    def depth_limited_search(self, limit):
+        """
+        One iteration: DFS over states whose bound does not exceed the limit.
+        :return: ((actions, cells), None) on success, else (None, smallest bound
+                 that exceeded the limit, or inf if nothing was cut off).
+        """
+        start, goal = self.maze.start, self.maze.goal
+        self.explored = {start}
+        best_depth = {start: 0}  # transposition table: state -> smallest depth reached
+        path = [start]
+        depths = [0]  # depth of each state on the path
+        on_path = {start}
+        actions = []
+        stack = [iter(self.maze.neighbors(start))]
+        nodes = 1
+        next_limit = float("inf")
+
+        while stack:
+            for action, state in stack[-1]:
+                depth = depths[-1] + self.step(path[-1], state)
+                if state in on_path or best_depth.get(state, float("inf")) <= depth:
+                    continue
+                bound = self.bound(state, depth)
+                if bound > limit:
+                    next_limit = min(next_limit, bound)
+                    continue
+                best_depth[state] = depth
+                nodes += 1
+
+                # Visualize the current state
+                self.visualizer.draw_maze(agent_position=state, explored=self.explored)
+
+                if state == goal:
+                    self.iteration_nodes.append(nodes)
+                    return (actions + [action], path[1:] + [state]), None
+
+                self.explored.add(state)
+                path.append(state)
+                depths.append(depth)
+                on_path.add(state)
+                actions.append(action)
+                stack.append(iter(self.maze.neighbors(state)))
+                break
             else:
-                raise Exception("Depth limit reached")
-        for action, neighbor in self.maze.neighbors(state):
-            try:
-                actions, cells = self.depth_limited_search(neighbor, depth - 1)
-                return [action] + actions, [state] + cells
-            except Exception:
-                continue
-        raise Exception("No solution")
+                # All neighbors done: backtrack
+                stack.pop()
+                on_path.discard(path.pop())
+                depths.pop()
+                if actions:
+                    actions.pop()
+
+        self.iteration_nodes.append(nodes)
+        return None, next_limit
+
+
+class IDAStar(IterativeDeepeningDFS):
+    """
+    IDA*: the same iterative DFS, but each iteration is bounded by f = path cost +
+    Manhattan distance, and the next limit is the smallest f that was cut off.
+    On 8-connected mazes diagonal steps cost sqrt(2) and the heuristic is octile.
+    """
+
+    def __init__(self, maze, visualizer):
+        super().__init__(maze, visualizer)
+        self.connectivity = getattr(maze, "connectivity", 4)
+
+    def heuristic(self, state):
+        """
+        Heuristic function: Manhattan (octile on 8-connected mazes) distance from
+        the current state to the goal.
+        """
+        x1, y1 = state
+        x2, y2 = self.maze.goal
+        return grid_distance(x1 - x2, y1 - y2, self.connectivity)
+
+    def step(self, state, following):
+        return grid_distance(following[0] - state[0], following[1] - state[1], self.connectivity)
+
+    def bound(self, state, depth):
+        # Sums of 1s and sqrt(2)s taken in another order differ in the last bits;
+        # rounding keeps them from becoming separate iteration limits
+        return round(depth + self.heuristic(state), 9)
 
 
 class HillClimbing():
@@ -405,4 +856,104 @@ class HillClimbing():
             if best_heuristic >= self.heuristic(current.state):
                 raise Exception("No solution (stuck in local minimum)")
 
-            current = best_neighbor
\ No newline at end of file
+            current = best_neighbor
+
+
+class JumpPointSearch():
+    def __init__(self, maze, visualizer):
+        if getattr(maze, "connectivity", 4) != 4:
+            raise Exception("Jump point search only supports 4-connected mazes.")
+        self.maze = maze
+        self.visualizer = visualizer
+        self.frontier = PriorityQueueFrontier()
+        self.explored = set()
+
+    def heuristic(self, state):
+        """
+        Heuristic function: Manhattan distance from the current state to the goal.
+        """
+        x1, y1 = state
+        x2, y2 = self.maze.goal
+        return abs(x1 - x2) + abs(y1 - y2)
+
+    def free(self, row, col):
+        return 0 <= row < self.maze.height and 0 <= col < self.maze.width and not self.maze.walls[row][col]
+
+    def jump(self, row, col, dr, dc):
+        """
+        Moves from (row, col) in direction (dr, dc) until the next jump point.
+        Horizontal moves stop at a forced neighbor (a free cell above or below whose
+        predecessor is a wall); vertical moves stop where a horizontal scan finds a
+        jump point. Returns the jump point, or None if the line hits a wall.
+        """
+        while True:
+            row += dr
+            col += dc
+            if not self.free(row, col):
+                return None
+            if (row, col) == self.maze.goal:
+                return (row, col)
+            if dc:
+                if self.free(row - 1, col) and not self.free(row - 1, col - dc):
+                    return (row, col)
+                if self.free(row + 1, col) and not self.free(row + 1, col - dc):
+                    return (row, col)
+            elif self.jump(row, col, 0, 1) is not None or self.jump(row, col, 0, -1) is not None:
+                return (row, col)
+
+    def directions(self, node):
+        """Directions worth exploring from a jump point, given how it was reached."""
+        if node.action is None:
+            return list(DIRECTIONS)
+        dr, dc = node.action
+        if dr:
+            # Vertical travel continues and may branch sideways
+            return [(dr, 0), (0, 1), (0, -1)]
+        row, col = node.state
+        result = [(0, dc)]
+        for side in (-1, 1):
+            if self.free(row + side, col) and not self.free(row + side, col - dc):
+                result.append((side, 0))
+        return result
+
+    def solve(self):
+        start = Node(state=self.maze.start, parent=None, action=None, cost=0, heuristic=self.heuristic(self.maze.start))
+        self.frontier.add(start)
+
+        while not self.frontier.empty():
+            node = self.frontier.remove()
+
+            # Visualize the current state
+            self.visualizer.draw_maze(agent_position=node.state, explored=self.explored)
+
+            if node.state == self.maze.goal:
+                return self.reconstruct_path(node)
+
+            self.explored.add(node.state)
+
+            row, col = node.state
+            for dr, dc in self.directions(node):
+                state = self.jump(row, col, dr, dc)
+                if state is None or state in self.explored:
+                    continue
+                cost = node.cost + abs(state[0] - row) + abs(state[1] - col)
+                child = Node(state=state, parent=node, action=(dr, dc), cost=cost, heuristic=self.heuristic(state))
+                self.frontier.add(child)
+
+        raise Exception("No solution")
+
+    def reconstruct_path(self, node):
+        """Expands the straight segments between jump points into unit moves."""
+        actions = []
+        cells = []
+        while node.parent is not None:
+            dr, dc = node.action
+            row, col = node.state
+            steps = abs(row - node.parent.state[0]) + abs(col - node.parent.state[1])
+            for i in range(steps):
+                actions.append(DIRECTIONS[(dr, dc)])
+                cells.append((row - i * dr, col - i * dc))
+            node = node.parent
+        actions.reverse()
+        cells.reverse()
+        return actions, cells
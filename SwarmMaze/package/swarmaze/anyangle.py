@@ -0,0 +1,150 @@
+import heapq
+import math
+
+import numpy as np
+
+from .maze import DIAGONAL_MOVES
+from .algorithms import ACTIONS
+
+
+# Moves considered by Theta*: the 4 cardinal moves, then the diagonals
+MOVES = ((-1, 0), (1, 0), (0, -1), (0, 1)) + tuple((dr, dc) for _, dr, dc in DIAGONAL_MOVES)
+
+
+def line_cells(source, targets):
+    """
+    Integer Bresenham-style lines from one cell to several cells at once.
+    :param source: (row, col) shared start of the lines.
+    :param targets: (k, 2) int array of end cells.
+    :return: (line, rows, cols): for every cell of every line, its line index and coordinates,
+             with each line's cells in order from source to target.
+    """
+    targets = np.asarray(targets, dtype=np.int64).reshape(-1, 2)
+    delta = targets - np.asarray(source, dtype=np.int64)
+    steps = np.abs(delta).max(axis=1)
+    lengths = steps + 1
+    line = np.repeat(np.arange(len(targets)), lengths)
+    t = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    n = np.maximum(steps, 1)[line]
+    # Round t * delta / n half up, in integers: floor((2 * t * delta + n) / (2 * n))
+    rows = source[0] + (2 * t * delta[line, 0] + n) // (2 * n)
+    cols = source[1] + (2 * t * delta[line, 1] + n) // (2 * n)
+    return line, rows, cols
+
+
+def lines_of_sight(blocked, source, targets):
+    """
+    Vectorized line-of-sight test from one cell to several cells.
+    A line is clear when every cell on it is free and no diagonal step along it
+    squeezes between two walls' corners (the 8-connected movement rule).
+    :param blocked: 2D bool array, True for walls.
+    :return: Bool array, one entry per target.
+    """
+    count = len(targets)
+    if count == 0:
+        return np.zeros(0, dtype=bool)
+    line, rows, cols = line_cells(source, targets)
+    hits = blocked[rows, cols]
+    same_line = line[1:] == line[:-1]
+    diagonal = same_line & (rows[1:] != rows[:-1]) & (cols[1:] != cols[:-1])
+    corner = diagonal & (blocked[rows[1:], cols[:-1]] | blocked[rows[:-1], cols[1:]])
+    hits[1:] |= corner
+    return np.bincount(line, weights=hits, minlength=count) == 0
+
+
+class ThetaStar():
+    def __init__(self, maze, visualizer):
+        """
+        Theta*: any-angle A* on the 8-connected grid. When a neighbor is in line
+        of sight of the current state's parent, it is linked straight to that
+        parent, so paths follow true straight lines instead of grid moves.
+        Line-of-sight checks for all neighbors of a state run as one NumPy batch.
+        :param maze: Maze or GridMaze (terrain costs are ignored).
+        """
+        self.maze = maze
+        self.visualizer = visualizer
+        self.blocked = np.asarray(maze.walls, dtype=bool)
+        self.free = (~self.blocked).tolist()
+        self.frontier = []  # heap of (f, h, state); outdated entries are skipped
+        self.g = {}
+        self.parent = {}
+        self.explored = set()
+        self.waypoints = []  # corners of the any-angle path, start first
+        self.length = None   # Euclidean length of the any-angle path
+
+    def heuristic(self, state):
+        """
+        Heuristic function: straight-line distance from the current state to the goal.
+        """
+        return math.hypot(state[0] - self.maze.goal[0], state[1] - self.maze.goal[1])
+
+    def neighbors(self, state):
+        """8-connected free neighbors; diagonals may not cut a wall corner."""
+        row, col = state
+        free = self.free
+        result = []
+        for dr, dc in MOVES:
+            r, c = row + dr, col + dc
+            if (0 <= r < self.maze.height and 0 <= c < self.maze.width and free[r][c]
+                    and free[row][c] and free[r][col]):
+                result.append((r, c))
+        return result
+
+    def solve(self):
+        start, goal = self.maze.start, self.maze.goal
+        self.g[start] = 0
+        self.parent[start] = start
+        heapq.heappush(self.frontier, (self.heuristic(start), self.heuristic(start), start))
+
+        while self.frontier:
+            f, h, state = heapq.heappop(self.frontier)
+            if state in self.explored or f != self.g[state] + h:
+                continue
+
+            # Visualize the current state
+            self.visualizer.draw_maze(agent_position=state, explored=self.explored)
+
+            if state == goal:
+                return self.reconstruct_path(state)
+
+            self.explored.add(state)
+
+            neighbors = [s for s in self.neighbors(state) if s not in self.explored]
+            parent = self.parent[state]
+            visible = lines_of_sight(self.blocked, parent, neighbors)
+            for neighbor, seen in zip(neighbors, visible):
+                # Link straight to the parent when it can see the neighbor
+                via = parent if seen else state
+                cost = self.g[via] + math.hypot(via[0] - neighbor[0], via[1] - neighbor[1])
+                if cost < self.g.get(neighbor, float("inf")):
+                    self.g[neighbor] = cost
+                    self.parent[neighbor] = via
+                    h = self.heuristic(neighbor)
+                    heapq.heappush(self.frontier, (cost + h, h, neighbor))
+
+        raise Exception("No solution")
+
+    def reconstruct_path(self, state):
+        """
+        Keeps the any-angle corners in `waypoints` and expands every straight
+        segment into the grid cells it crosses, so the result is still a list of
+        single moves like every other solver returns.
+        """
+        waypoints = [state]
+        while self.parent[state] != state:
+            state = self.parent[state]
+            waypoints.append(state)
+        waypoints.reverse()
+        self.waypoints = waypoints
+        self.length = self.g[waypoints[-1]]
+
+        actions = []
+        cells = []
+        previous = waypoints[0]
+        for a, b in zip(waypoints, waypoints[1:]):
+            _, rows, cols = line_cells(a, [b])
+            for cell in zip(rows[1:].tolist(), cols[1:].tolist()):
+                actions.append(ACTIONS[(cell[0] - previous[0], cell[1] - previous[1])])
+                cells.append(cell)
+                previous = cell
+        return actions, cells
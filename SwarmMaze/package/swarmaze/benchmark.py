@@ -0,0 +1,170 @@
+import argparse
+import csv
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+import tracemalloc
+
+from .maze import Maze
+from .headless import NullVisualizer
+from .main import ALGORITHMS
+
+
+FIELDS = ["maze", "algorithm", "status", "wall_time", "nodes_expanded", "peak_frontier", "path_length", "peak_memory"]
+
+
+class MeterVisualizer(NullVisualizer):
+    def __init__(self, maze=None, delay=0):
+        """
+        Headless visualizer that counts expansions and samples the size of the
+        solver's frontiers on every frame.
+        """
+        super().__init__(maze, delay)
+        self.expanded = 0
+        self.peak_frontier = 0
+        self.frontiers = []
+
+    def watch(self, solver):
+        """Tracks every frontier attribute of a solver (frontier, frontier_start, frontier_goal, ...)."""
+        self.frontiers = [value for name, value in vars(solver).items()
+                          if name.startswith("frontier") and hasattr(value, "__len__")]
+
+    def draw_maze(self, agent_position=None, explored=None, solution=None):
+        if agent_position is None:
+            return
+        self.expanded += 1
+        size = sum(len(frontier) for frontier in self.frontiers)
+        if size > self.peak_frontier:
+            self.peak_frontier = size
+
+
+def run_once(maze_file, algorithm, grid=False, trace_memory=False):
+    """
+    Solves one maze with one algorithm, headless.
+    :return: A result dict with the FIELDS columns.
+    """
+    maze = Maze(maze_file)
+    if grid:
+        maze = maze.to_grid()
+    meter = MeterVisualizer(maze)
+    solver = ALGORITHMS[algorithm](maze, meter)
+    meter.watch(solver)
+
+    result = {"maze": os.path.basename(maze_file), "algorithm": algorithm}
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        actions, cells = solver.solve()
+        result["status"] = "solved"
+        result["path_length"] = len(cells)
+    except Exception as e:
+        result["status"] = str(e)
+        result["path_length"] = None
+    result["wall_time"] = time.perf_counter() - start
+    if trace_memory:
+        result["peak_memory"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    result["nodes_expanded"] = meter.expanded
+    result["peak_frontier"] = meter.peak_frontier
+    return result
+
+
+def _worker(connection, maze_file, algorithm, grid, memory):
+    try:
+        # Timing pass first; tracemalloc slows the solver down, so memory gets its own pass
+        result = run_once(maze_file, algorithm, grid)
+        if memory:
+            result["peak_memory"] = run_once(maze_file, algorithm, grid, trace_memory=True)["peak_memory"]
+    except BaseException as e:
+        result = {"maze": os.path.basename(maze_file), "algorithm": algorithm, "status": f"error: {e}"}
+    connection.send(result)
+    connection.close()
+
+
+def run_isolated(maze_file, algorithm, grid=False, memory=True, timeout=60):
+    """
+    Runs one benchmark in a child process so a slow or runaway solver can be
+    stopped after `timeout` seconds without taking the whole suite down.
+    """
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_worker, args=(sender, maze_file, algorithm, grid, memory))
+    process.start()
+    sender.close()
+    if receiver.poll(timeout):
+        try:
+            result = receiver.recv()
+        except EOFError:
+            result = {"maze": os.path.basename(maze_file), "algorithm": algorithm,
+                      "status": f"crashed (exit code {process.exitcode})"}
+    else:
+        result = {"maze": os.path.basename(maze_file), "algorithm": algorithm, "status": f"timeout ({timeout}s)"}
+    process.kill()
+    process.join()
+    return result
+
+
+def run_suite(maze_files, algorithms, grid=False, memory=True, timeout=60):
+    """Benchmarks every algorithm on every maze and yields one result dict per run."""
+    for maze_file in maze_files:
+        for algorithm in algorithms:
+            yield run_isolated(maze_file, algorithm, grid, memory, timeout)
+
+
+def write_csv(results, filename):
+    with open(filename, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for result in results:
+            writer.writerow({field: result.get(field) for field in FIELDS})
+
+
+def write_json(results, filename):
+    with open(filename, "w") as f:
+        json.dump([{field: result.get(field) for field in FIELDS} for result in results], f, indent=2)
+
+
+def _fmt(value, spec=""):
+    return "-" if value is None else format(value, spec)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="swarmaze-bench",
+                                     description="Benchmark every swarmaze algorithm on a directory of mazes.")
+    parser.add_argument("directory", help="directory containing maze files")
+    parser.add_argument("--pattern", default="*.txt", help="glob for maze files inside the directory (default: *.txt)")
+    parser.add_argument("--algorithms", nargs="+", type=str.lower, choices=sorted(ALGORITHMS),
+                        default=list(ALGORITHMS), help="algorithms to run (default: all)")
+    parser.add_argument("--grid", action="store_true", help="solve on the NumPy grid backend")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak memory pass")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds allowed per run (default: 60)")
+    parser.add_argument("--csv", metavar="FILE", help="write results as CSV")
+    parser.add_argument("--json", metavar="FILE", help="write results as JSON")
+    args = parser.parse_args(argv)
+
+    maze_files = sorted(glob.glob(os.path.join(args.directory, args.pattern)))
+    if not maze_files:
+        sys.exit(f"Error: no maze files matching '{args.pattern}' in '{args.directory}'.")
+
+    results = []
+    print(f"{'maze':<24} {'algorithm':<14} {'status':<16} {'time (s)':>9} {'expanded':>9} {'frontier':>9} {'path':>6} {'memory':>10}")
+    for result in run_suite(maze_files, args.algorithms, args.grid, not args.no_memory, args.timeout):
+        results.append(result)
+        print(f"{result['maze']:<24} {result['algorithm']:<14} {result['status'][:16]:<16} "
+              f"{_fmt(result.get('wall_time'), '.4f'):>9} {_fmt(result.get('nodes_expanded')):>9} "
+              f"{_fmt(result.get('peak_frontier')):>9} {_fmt(result.get('path_length')):>6} "
+              f"{_fmt(result.get('peak_memory')):>10}")
+
+    if args.csv:
+        write_csv(results, args.csv)
+        print(f"Results written to {args.csv}")
+    if args.json:
+        write_json(results, args.json)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import heapq
+
+from .algorithms import DIRECTIONS
+
+
+INF = float("inf")
+
+
+class DStarLite():
+    def __init__(self, maze, visualizer):
+        """
+        D* Lite incremental planner. The search runs backwards from the goal and
+        keeps its g/rhs values between calls to solve(); after walls change
+        (Maze.set_wall / toggle_wall) or the start moves, only the vertices whose
+        costs are affected are re-expanded.
+        :param maze: 4-connected Maze or GridMaze; its change log is read on every solve().
+        :param visualizer: Visualizer (or headless stand-in) notified of expansions.
+        """
+        if getattr(maze, "connectivity", 4) != 4:
+            raise Exception("D* Lite only supports 4-connected mazes.")
+        self.maze = maze
+        self.visualizer = visualizer
+        self.goal = maze.goal
+        self.g = {}
+        self.rhs = {self.goal: 0}
+        self.queue = []
+        self.keys = {}  # state -> key of its live queue entry (stale entries are skipped)
+        self.km = 0
+        self.last_start = maze.start
+        self.version = maze.version
+        self.explored = set()
+        self.expansions = 0
+        self._push(self.goal)
+
+    def heuristic(self, a, b):
+        """
+        Heuristic function: Manhattan distance between two states.
+        """
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    def blocked(self, state):
+        return bool(self.maze.walls[state[0]][state[1]])
+
+    def adjacent(self, state):
+        """In-bounds 4-neighbors, walls included, since a wall may open later."""
+        row, col = state
+        for dr, dc in DIRECTIONS:
+            r, c = row + dr, col + dc
+            if 0 <= r < self.maze.height and 0 <= c < self.maze.width:
+                yield (r, c)
+
+    def cost(self, a, b):
+        return INF if self.blocked(a) or self.blocked(b) else 1
+
+    def key(self, state):
+        best = min(self.g.get(state, INF), self.rhs.get(state, INF))
+        return (best + self.heuristic(self.maze.start, state) + self.km, best)
+
+    def _push(self, state):
+        key = self.key(state)
+        self.keys[state] = key
+        heapq.heappush(self.queue, (key, state))
+
+    def update_vertex(self, state):
+        if state != self.goal:
+            self.rhs[state] = min((self.cost(state, s) + self.g.get(s, INF) for s in self.adjacent(state)), default=INF)
+        if self.g.get(state, INF) != self.rhs.get(state, INF):
+            self._push(state)
+        else:
+            self.keys.pop(state, None)
+
+    def _top(self):
+        # Drop stale entries left behind by re-pushes
+        while self.queue and self.keys.get(self.queue[0][1]) != self.queue[0][0]:
+            heapq.heappop(self.queue)
+        return self.queue[0] if self.queue else ((INF, INF), None)
+
+    def compute_shortest_path(self):
+        start = self.maze.start
+        while True:
+            top_key, state = self._top()
+            if state is None:
+                break
+            if top_key >= self.key(start) and self.rhs.get(start, INF) == self.g.get(start, INF):
+                break
+
+            # Visualize the current state
+            self.visualizer.draw_maze(agent_position=state, explored=self.explored)
+            self.expansions += 1
+
+            new_key = self.key(state)
+            if top_key < new_key:
+                self._push(state)
+                continue
+            heapq.heappop(self.queue)
+            del self.keys[state]
+            if self.g.get(state, INF) > self.rhs.get(state, INF):
+                self.g[state] = self.rhs[state]
+                self.explored.add(state)
+                for s in self.adjacent(state):
+                    self.update_vertex(s)
+            else:
+                self.g[state] = INF
+                self.explored.discard(state)
+                self.update_vertex(state)
+                for s in self.adjacent(state):
+                    self.update_vertex(s)
+
+    def apply_changes(self):
+        """Repairs the search after the start moved or walls changed since the last solve()."""
+        start = self.maze.start
+        if start != self.last_start:
+            self.km += self.heuristic(self.last_start, start)
+            self.last_start = start
+        changed = self.maze.changes_since(self.version)
+        self.version = self.maze.version
+        for cell in changed:
+            # Edges into and out of the cell changed cost
+            self.update_vertex(cell)
+            for s in self.adjacent(cell):
+                self.update_vertex(s)
+
+    def solve(self):
+        if self.maze.goal != self.goal:
+            raise Exception("D* Lite cannot follow a moving goal; create a new planner.")
+        self.apply_changes()
+        self.compute_shortest_path()
+
+        start = self.maze.start
+        if self.g.get(start, INF) == INF:
+            raise Exception("No solution")
+
+        actions = []
+        cells = []
+        state = start
+        while state != self.goal:
+            state_next = min(self.adjacent(state), key=lambda s: self.cost(state, s) + self.g.get(s, INF))
+            actions.append(DIRECTIONS[(state_next[0] - state[0], state_next[1] - state[1])])
+            cells.append(state_next)
+            state = state_next
+        return actions, cells
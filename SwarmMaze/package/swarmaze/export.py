@@ -0,0 +1,475 @@
+import argparse
+import os
+import struct
+import sys
+
+import numpy as np
+
+from .maze import Maze
+from .headless import read_log
+
+
+# Same colors as the on-screen Visualizer
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+BLUE = (0, 0, 255)
+YELLOW = (255, 255, 0)
+PURPLE = (128, 0, 128)
+
+# Palette indices of the single-agent animation
+EMPTY, WALL, START, GOAL, AGENT, EXPLORED, SOLUTION = range(7)
+SEARCH_PALETTE = (BLACK, WHITE, RED, GREEN, BLUE, YELLOW, PURPLE)
+
+# Largest code an animated GIF's LZW dictionary may hold
+MAX_CODE = 4095
+
+
+class Canvas():
+    def __init__(self, walls, palette, cell_size=8, protected=()):
+        """
+        Off-screen frame buffer holding one palette index per maze cell.
+        Painting records the bounding box of the cells that changed, so a
+        writer only has to encode that rectangle for the next frame.
+        :param walls: 2D array-like, truthy where a cell is a wall.
+        :param palette: Sequence of (r, g, b) colors, at most 256.
+        :param cell_size: Side of a cell in pixels; cells of 4 pixels or more get a black grid line.
+        :param protected: Cells (besides walls) that keep their initial color, e.g. start and goal.
+        """
+        walls = np.asarray(walls, dtype=bool)
+        if len(palette) > 256:
+            raise Exception("A frame palette holds at most 256 colors.")
+        self.palette = np.asarray(palette, dtype=np.uint8)
+        self.cell_size = cell_size
+        self.cells = np.where(walls, WALL, EMPTY).astype(np.uint8)
+        self.fixed = walls.copy()
+        for row, col in protected:
+            self.fixed[row, col] = True
+        self.height, self.width = self.cells.shape
+        self.dirty = [0, 0, self.height, self.width]  # top, left, bottom, right (exclusive)
+
+    @property
+    def size(self):
+        """(width, height) of a full frame in pixels."""
+        return self.width * self.cell_size, self.height * self.cell_size
+
+    def _touch(self, top, left, bottom, right):
+        if self.dirty is None:
+            self.dirty = [top, left, bottom, right]
+        else:
+            self.dirty = [min(self.dirty[0], top), min(self.dirty[1], left),
+                          max(self.dirty[2], bottom), max(self.dirty[3], right)]
+
+    def fix(self, cell, color):
+        """Paints a protected cell once (e.g. the start or goal marker)."""
+        row, col = cell
+        self.cells[row, col] = color
+        self._touch(row, col, row + 1, col + 1)
+
+    def paint(self, cell, color):
+        """Paints one cell unless it is a wall or protected."""
+        row, col = cell
+        if self.fixed[row, col] or self.cells[row, col] == color:
+            return
+        self.cells[row, col] = color
+        self._touch(row, col, row + 1, col + 1)
+
+    def paint_many(self, cells, color):
+        """Paints several cells at once (vectorized version of paint)."""
+        if not len(cells):
+            return
+        rows, cols = np.asarray(cells, dtype=np.intp).T
+        keep = ~self.fixed[rows, cols] & (self.cells[rows, cols] != color)
+        rows, cols = rows[keep], cols[keep]
+        if rows.size:
+            self.cells[rows, cols] = color
+            self._touch(int(rows.min()), int(cols.min()), int(rows.max()) + 1, int(cols.max()) + 1)
+
+    def pixels(self, top=0, left=0, bottom=None, right=None):
+        """Palette-index pixels of a block of cells, upscaled to cell_size."""
+        block = self.cells[top:bottom, left:right]
+        size = self.cell_size
+        pixels = np.repeat(np.repeat(block, size, axis=0), size, axis=1)
+        if size >= 4:
+            # Grid lines along the bottom and right edge of every cell, as on screen
+            pixels[size - 1::size, :] = EMPTY
+            pixels[:, size - 1::size] = EMPTY
+        return pixels
+
+    def take_dirty(self):
+        """
+        Returns the changed region since the previous call and marks it clean.
+        :return: (left, top, pixels) in pixel coordinates, or None if nothing changed.
+        """
+        if self.dirty is None:
+            return None
+        top, left, bottom, right = self.dirty
+        self.dirty = None
+        return left * self.cell_size, top * self.cell_size, self.pixels(top, left, bottom, right)
+
+    def rgb(self):
+        """The full frame as an (height, width, 3) uint8 RGB array."""
+        return self.palette[self.pixels()]
+
+
+def lzw_encode(pixels, min_code_size):
+    """
+    GIF flavored LZW compression of a sequence of palette indices.
+    :return: The code stream as bytes (before splitting into sub-blocks).
+    """
+    clear = 1 << min_code_size
+    end = clear + 1
+    out = bytearray()
+    buffer = 0
+    bits = 0
+    code_size = min_code_size + 1
+    next_code = end + 1
+    table = {}
+
+    def emit(code):
+        nonlocal buffer, bits
+        buffer |= code << bits
+        bits += code_size
+        while bits >= 8:
+            out.append(buffer & 0xFF)
+            buffer >>= 8
+            bits -= 8
+
+    emit(clear)
+    data = bytes(pixels)
+    prefix = data[0]
+    for value in data[1:]:
+        # Strings are keyed by (code of the prefix, next index)
+        key = prefix << 8 | value
+        code = table.get(key)
+        if code is not None:
+            prefix = code
+            continue
+        emit(prefix)
+        if next_code <= MAX_CODE:
+            table[key] = next_code
+            next_code += 1
+            # The decoder lags one code behind, so widen only once it has caught up
+            if next_code > 1 << code_size and code_size < 12:
+                code_size += 1
+        else:
+            emit(clear)
+            table.clear()
+            code_size = min_code_size + 1
+            next_code = end + 1
+        prefix = value
+    emit(prefix)
+    emit(end)
+    if bits:
+        out.append(buffer & 0xFF)
+    return bytes(out)
+
+
+class GifWriter():
+    def __init__(self, filename, size, palette, fps=30, loop=0):
+        """
+        Streaming animated GIF encoder. Every frame is written to the file as
+        soon as it is added, and only the changed rectangle of each frame is
+        encoded, so memory stays bounded by one frame.
+        :param filename: Path of the .gif file to write.
+        :param size: (width, height) of the animation in pixels.
+        :param palette: Sequence of (r, g, b) colors, at most 256.
+        :param fps: Frames per second (GIF delays have a 1/100 s resolution).
+        :param loop: Number of repetitions; 0 loops forever.
+        """
+        width, height = size
+        if width > 0xFFFF or height > 0xFFFF:
+            raise Exception("GIF frames are limited to 65535 pixels per side; use a smaller cell size.")
+        self.delay = max(2, round(100 / fps))
+        # The color table must have a power of two entries (at least 4 for LZW)
+        self.depth = max(2, (len(palette) - 1).bit_length())
+        table = bytearray(3 << self.depth)
+        for i, color in enumerate(palette):
+            table[3 * i:3 * i + 3] = bytes(color)
+
+        self.file = open(filename, "wb")
+        self.file.write(b"GIF89a")
+        self.file.write(struct.pack("<HHBBB", width, height, 0xF0 | (self.depth - 1), 0, 0))
+        self.file.write(table)
+        self.file.write(b"\x21\xFF\x0BNETSCAPE2.0" + struct.pack("<BBHB", 3, 1, loop, 0))
+        self.frames = 0
+
+    def add_frame(self, pixels, left=0, top=0, delay=None):
+        """
+        Appends a frame drawn over the previous one.
+        :param pixels: 2D uint8 array of palette indices.
+        :param left: Pixel column of the frame's top-left corner.
+        :param top: Pixel row of the frame's top-left corner.
+        :param delay: Display time in 1/100 s (default: from fps).
+        """
+        height, width = pixels.shape
+        # Graphic control extension: keep the previous frame underneath (disposal 1)
+        self.file.write(struct.pack("<BBBBHBB", 0x21, 0xF9, 4, 1 << 2, self.delay if delay is None else delay, 0, 0))
+        self.file.write(struct.pack("<BHHHHB", 0x2C, left, top, width, height, 0))
+        self.file.write(bytes([self.depth]))
+        data = lzw_encode(np.ascontiguousarray(pixels, dtype=np.uint8).tobytes(), self.depth)
+        for i in range(0, len(data), 255):
+            chunk = data[i:i + 255]
+            self.file.write(bytes([len(chunk)]) + chunk)
+        self.file.write(b"\x00")
+        self.frames += 1
+
+    def write(self, canvas, delay=None):
+        """Appends the changes painted on a canvas since its previous frame."""
+        region = canvas.take_dirty()
+        if region is None:
+            # Nothing changed: repeat one pixel so the frame still takes its time slot
+            region = 0, 0, canvas.pixels(0, 0, 1, 1)[:1, :1]
+        left, top, pixels = region
+        self.add_frame(pixels, left, top, delay)
+
+    def close(self):
+        self.file.write(b"\x3B")
+        self.file.close()
+
+
+class VideoWriter():
+    def __init__(self, filename, size, palette, fps=30):
+        """
+        Streaming video encoder (MP4 and the other formats of imageio's ffmpeg
+        plugin). Needs the optional imageio and imageio-ffmpeg packages.
+        """
+        try:
+            import imageio
+        except ImportError:
+            raise Exception("Video export needs imageio: pip install swarmaze[export]")
+        self.fps = fps
+        self.writer = imageio.get_writer(filename, fps=fps, macro_block_size=1)
+        self.frames = 0
+
+    def write(self, canvas, delay=None):
+        canvas.take_dirty()
+        frame = canvas.rgb()
+        # A longer delay is shown by repeating the frame
+        repeat = 1 if delay is None else max(1, round(delay * self.fps / 100))
+        for _ in range(repeat):
+            self.writer.append_data(frame)
+            self.frames += 1
+
+    def close(self):
+        self.writer.close()
+
+
+def open_writer(filename, canvas, fps=30):
+    """Picks the encoder from the file extension: .gif, anything else goes to video."""
+    if os.path.splitext(filename)[1].lower() == ".gif":
+        return GifWriter(filename, canvas.size, canvas.palette.tolist(), fps)
+    return VideoWriter(filename, canvas.size, canvas.palette.tolist(), fps)
+
+
+class ExportVisualizer():
+    def __init__(self, maze, filename, cell_size=8, fps=30, per_frame=1, hold=2):
+        """
+        Headless visualizer that encodes the search into an animation while the
+        solver runs, using the same colors as the on-screen Visualizer.
+        Call close() once the solver is done.
+        :param maze: The maze being solved.
+        :param filename: Output .gif or video file.
+        :param cell_size: Side of a cell in pixels.
+        :param fps: Frames per second of the animation.
+        :param per_frame: Expansions coalesced into each frame.
+        :param hold: Seconds the final frame stays on screen.
+        """
+        self.maze = maze
+        self.delay = 0
+        self.per_frame = max(1, per_frame)
+        self.hold = hold
+        self.canvas = Canvas(maze.walls, SEARCH_PALETTE, cell_size, protected=(maze.start, maze.goal))
+        self.canvas.fix(maze.start, START)
+        self.canvas.fix(maze.goal, GOAL)
+        self.writer = open_writer(filename, self.canvas, fps)
+        self.agent_position = None
+        self.pending = 0
+
+    def draw_maze(self, agent_position=None, explored=None, solution=None):
+        if solution is not None:
+            if self.agent_position is not None:
+                self.canvas.paint(self.agent_position, EXPLORED)
+                self.agent_position = None
+            self.canvas.paint_many(list(solution), SOLUTION)
+            self._flush()
+        elif agent_position is not None:
+            if self.agent_position is not None:
+                self.canvas.paint(self.agent_position, EXPLORED)
+            self.canvas.paint(agent_position, AGENT)
+            self.agent_position = agent_position
+            self.pending += 1
+            if self.pending >= self.per_frame:
+                self._flush()
+
+    def _flush(self, delay=None):
+        self.writer.write(self.canvas, delay)
+        self.pending = 0
+
+    def wait_for_exit(self):
+        pass
+
+    def close(self):
+        """Writes the final frame, held for `hold` seconds, and finishes the file."""
+        self._flush(delay=round(self.hold * 100))
+        self.writer.close()
+        return self.writer.frames
+
+
+def export_log(maze, log_file, filename, cell_size=8, fps=30, per_frame=None, max_frames=600):
+    """
+    Renders an event log written by RecordingVisualizer.save (swarmaze --headless --log).
+    :param maze: The maze the log was recorded on.
+    :param per_frame: Expansions per frame; None picks it so the animation has at most max_frames frames.
+    :return: Number of frames written.
+    """
+    header, events = read_log(log_file)
+    if header and (header["height"], header["width"]) != (maze.height, maze.width):
+        raise Exception(f"Log '{log_file}' was recorded on a {header['height']}x{header['width']} maze.")
+    if per_frame is None:
+        # Count the expansion lines first; the log is streamed twice instead of loaded
+        with open(log_file) as f:
+            expansions = sum(1 for line in f if line.startswith("["))
+        per_frame = -(-expansions // max_frames)
+    visualizer = ExportVisualizer(maze, filename, cell_size, fps, per_frame)
+    for kind, data in events:
+        if kind == "expand":
+            visualizer.draw_maze(agent_position=data)
+        else:
+            visualizer.draw_maze(solution=data)
+    return visualizer.close()
+
+
+def export_solver(solver_class, maze, filename, cell_size=8, fps=30, per_frame=1):
+    """
+    Solves a maze and renders the search straight into an animation.
+    :return: The solver's (actions, cells); the file is written even if the solver fails.
+    """
+    visualizer = ExportVisualizer(maze, filename, cell_size, fps, per_frame)
+    try:
+        actions, cells = solver_class(maze, visualizer).solve()
+        visualizer.draw_maze(solution=cells)
+    finally:
+        visualizer.close()
+    return actions, cells
+
+
+def export_agents(walls, goals, exploration_traces, paths, filename, trace_colors, agent_colors,
+                  shared_color=(150, 150, 150), cell_size=8, fps=30, per_frame=1, hold=2):
+    """
+    Renders a multi-agent run the way the 3agents visualizer shows it: the
+    exploration traces grow side by side, then the agents walk their paths.
+    :param walls: 2D array-like, truthy where a cell is a wall.
+    :param goals: (row, col) of the shared goal, or a list of goal cells.
+    :param exploration_traces: One list of explored cells per agent.
+    :param paths: One list of cells (start first) per agent.
+    :param trace_colors: One (r, g, b) trace/path color per agent.
+    :param agent_colors: One (r, g, b) marker color per agent. Agents may share colors;
+        only the distinct ones take palette entries.
+    :param shared_color: Color of cells used by several agents.
+    :param per_frame: Exploration steps coalesced into each frame.
+    :return: Number of frames written.
+    """
+    if goals and isinstance(goals[0], int):
+        goals = [goals]
+    goals = [tuple(goal) for goal in goals or ()]
+
+    # Palette: background, wall, goal, shared, then the distinct trace and marker colors
+    palette = [BLACK, WHITE, GREEN, tuple(shared_color)]
+    index = {color: i for i, color in enumerate(palette)}
+    for color in list(trace_colors) + list(agent_colors):
+        index.setdefault(tuple(color), len(index))
+    palette = list(index)
+    goal_color, shared = 2, 3
+    trace_color = [index[tuple(color)] for color in trace_colors]
+    agent_color = [index[tuple(color)] for color in agent_colors]
+
+    canvas = Canvas(walls, palette, cell_size, protected=goals)
+    for goal in goals:
+        canvas.fix(goal, goal_color)
+    writer = open_writer(filename, canvas, fps)
+    owner = np.full((canvas.height, canvas.width), -1, dtype=np.int16)  # agent per cell, -2 shared
+
+    def mark(cell, agent):
+        row, col = cell
+        if owner[row, col] == -1:
+            owner[row, col] = agent
+        elif owner[row, col] != agent:
+            owner[row, col] = -2
+        return trace_color[agent] if owner[row, col] >= 0 else shared
+
+    def show(positions):
+        # Agents are drawn on top; the cells they leave get their trace color back
+        for agent, cell in enumerate(positions):
+            canvas.paint(cell, agent_color[agent])
+        writer.write(canvas)
+        for cell in positions:
+            row, col = cell
+            who = owner[row, col]
+            canvas.paint(cell, EMPTY if who == -1 else shared if who == -2 else trace_color[who])
+
+    # Exploration: every trace grows by one cell per step, agents wait at their first cell
+    steps = max((len(trace) for trace in exploration_traces), default=0)
+    starts = [trace[0] for trace in exploration_traces if trace]
+    for step in range(steps):
+        for agent, trace in enumerate(exploration_traces):
+            if step < len(trace):
+                canvas.paint(trace[step], mark(trace[step], agent))
+        if (step + 1) % per_frame == 0 or step == steps - 1:
+            show(starts)
+
+    # Execution: clear the traces, then walk every agent along its path
+    canvas.paint_many([tuple(cell) for cell in np.argwhere(owner != -1)], EMPTY)
+    owner[:] = -1
+    for step in range(max((len(path) for path in paths), default=0)):
+        positions = []
+        for agent, path in enumerate(paths):
+            cell = path[min(step, len(path) - 1)]
+            canvas.paint(cell, mark(cell, agent))
+            positions.append(cell)
+        show(positions)
+    writer.write(canvas, delay=round(hold * 100))
+    writer.close()
+    return writer.frames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="swarmaze-export",
+                                     description="Render a search to an animated GIF or MP4 without opening a window.")
+    parser.add_argument("maze", help="maze file")
+    parser.add_argument("output", help="file to write (.gif, or .mp4 with imageio installed)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--algorithm", type=str.lower, help="run this algorithm and record its search")
+    source.add_argument("--log", metavar="FILE", help="render an event log saved by swarmaze --headless --log")
+    parser.add_argument("--cell-size", type=int, default=8, help="cell side in pixels (default: 8)")
+    parser.add_argument("--fps", type=float, default=30, help="frames per second (default: 30)")
+    parser.add_argument("--per-frame", type=int, help="expansions per frame (default: 1, or fit --max-frames for logs)")
+    parser.add_argument("--max-frames", type=int, default=600, help="frame budget when rendering a log (default: 600)")
+    args = parser.parse_args(argv)
+    if args.cell_size < 1 or args.fps <= 0:
+        parser.error("--cell-size and --fps must be positive")
+
+    # Maze() reports a missing or malformed file and exits on its own
+    maze = Maze(args.maze)
+
+    if args.log:
+        frames = export_log(maze, args.log, args.output, args.cell_size, args.fps, args.per_frame, args.max_frames)
+        print(f"{frames} frames written to {args.output}")
+        return
+
+    from .main import ALGORITHMS
+    if args.algorithm not in ALGORITHMS:
+        parser.error(f"unknown algorithm '{args.algorithm}' (choose from {', '.join(ALGORITHMS)})")
+    try:
+        actions, cells = export_solver(ALGORITHMS[args.algorithm], maze, args.output,
+                                       args.cell_size, args.fps, args.per_frame or 1)
+    except Exception as e:
+        print(f"No solution: {e}; the search was still written to {args.output}")
+        sys.exit(1)
+    print(f"Solution found! Path length: {len(cells)}")
+    print(f"Animation written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
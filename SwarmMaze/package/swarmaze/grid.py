@@ -0,0 +1,170 @@
+import numpy as np
+
+from .maze import record_change, DIAGONAL_MOVES
+
+
+# Moves in the same order as Maze.neighbors: (action, row offset, col offset);
+# the diagonals (bits 4-7) are only set on 8-connected grids
+MOVES = (("up", -1, 0), ("down", 1, 0), ("left", 0, -1), ("right", 0, 1)) + DIAGONAL_MOVES
+
+# For every 8-bit move mask, the moves whose bit is set
+MOVE_TABLE = tuple(
+    tuple(move for bit, move in enumerate(MOVES) if mask >> bit & 1)
+    for mask in range(256)
+)
+
+
+class GridMaze():
+    def __init__(self, walls, start, goal, costs=None):
+        """
+        Compact maze backed by a contiguous NumPy array.
+        Each cell also gets a bit mask of its legal moves (one byte per cell),
+        so neighbors() needs no bounds or wall checks in the search loop.
+        Set `connectivity = 8` to add diagonal moves (masks are rebuilt).
+        :param walls: 2D array-like, truthy where a cell is a wall.
+        :param start: (row, col) of the start cell.
+        :param goal: (row, col) of the goal cell.
+        :param costs: Optional per-cell traversal costs (2D or flat row-major, 1-255);
+                      kept as a flat byte table for fast lookups in the search loop.
+        """
+        self.walls = np.ascontiguousarray(walls, dtype=bool)
+        if self.walls.ndim != 2:
+            raise Exception("Maze walls must be a 2D grid.")
+        self.height, self.width = self.walls.shape
+        self.start = tuple(start)
+        self.goal = tuple(goal)
+        self.solution = None
+        self.changes = []  # cells whose wall state changed, in order
+        self.costs = None
+        self.min_cost = 1
+        if costs is not None:
+            table = np.asarray(costs, dtype=np.uint8).reshape(-1)
+            if table.size != self.walls.size:
+                raise Exception("Maze costs must have one entry per cell.")
+            self.costs = bytearray(table.tobytes())
+            # Cheapest cell to enter besides the start and goal (see maze.min_cost)
+            enterable = ~self.walls.reshape(-1)
+            enterable[[self.start[0] * self.width + self.start[1], self.goal[0] * self.width + self.goal[1]]] = False
+            free = table[enterable]
+            self.min_cost = int(free.min()) if free.size else 1
+
+        self._connectivity = 4
+        self.moves = bytearray(self._move_masks().tobytes())
+        # Flat-index offsets of each mask's moves, for solvers working on cell ids
+        self.offsets = tuple(
+            tuple(dr * self.width + dc for _, dr, dc in moves)
+            for moves in MOVE_TABLE
+        )
+
+    @classmethod
+    def from_maze(cls, maze):
+        return cls(maze.walls, maze.start, maze.goal, getattr(maze, "costs", None))
+
+    @classmethod
+    def from_file(cls, filename, cache=False):
+        """Loads a maze file with the vectorized loader (see loader.load_grid)."""
+        from .loader import load_grid
+        return load_grid(filename, cache)
+
+    @property
+    def connectivity(self):
+        return self._connectivity
+
+    @connectivity.setter
+    def connectivity(self, value):
+        if value not in (4, 8):
+            raise Exception("Connectivity must be 4 or 8.")
+        self._connectivity = value
+        self.moves[:] = self._move_masks().tobytes()
+
+    def _move_masks(self):
+        free = ~self.walls
+        mask = np.zeros(self.walls.shape, dtype=np.uint8)
+        # A move is legal when both the cell and its neighbor are free
+        mask[1:, :] |= (free[1:, :] & free[:-1, :]).astype(np.uint8) << 0     # up
+        mask[:-1, :] |= (free[:-1, :] & free[1:, :]).astype(np.uint8) << 1    # down
+        mask[:, 1:] |= (free[:, 1:] & free[:, :-1]).astype(np.uint8) << 2     # left
+        mask[:, :-1] |= (free[:, :-1] & free[:, 1:]).astype(np.uint8) << 3    # right
+        if self._connectivity == 8:
+            # Diagonals also need both orthogonal cells free (no corner cutting)
+            for bit, (_, dr, dc) in enumerate(DIAGONAL_MOVES, start=4):
+                src_rows = slice(max(-dr, 0), self.height + min(-dr, 0))
+                src_cols = slice(max(-dc, 0), self.width + min(-dc, 0))
+                dst_rows = slice(max(dr, 0), self.height + min(dr, 0))
+                dst_cols = slice(max(dc, 0), self.width + min(dc, 0))
+                legal = (free[src_rows, src_cols] & free[dst_rows, dst_cols]
+                         & free[dst_rows, src_cols] & free[src_rows, dst_cols])
+                mask[src_rows, src_cols] |= legal.astype(np.uint8) << bit
+        return mask
+
+    def _update_moves(self, row, col):
+        """Recomputes the move masks of the 3x3 block around a cell after a wall change."""
+        moves = MOVES if self._connectivity == 8 else MOVES[:4]
+        for r in range(row - 1, row + 2):
+            for c in range(col - 1, col + 2):
+                if not (0 <= r < self.height and 0 <= c < self.width):
+                    continue
+                mask = 0
+                if not self.walls[r, c]:
+                    for bit, (_, dr, dc) in enumerate(moves):
+                        rr, cc = r + dr, c + dc
+                        if (0 <= rr < self.height and 0 <= cc < self.width and not self.walls[rr, cc]
+                                and not self.walls[r, cc] and not self.walls[rr, c]):
+                            mask |= 1 << bit
+                self.moves[r * self.width + c] = mask
+
+    @property
+    def version(self):
+        """Number of wall changes so far; pass it to changes_since() later."""
+        return len(self.changes)
+
+    def changes_since(self, version):
+        """Set of cells whose wall state changed after the given version."""
+        return set(self.changes[version:])
+
+    def set_wall(self, state, wall=True):
+        """
+        Closes (wall=True) or opens (wall=False) a cell, keeping the move masks in sync.
+        :return: True if the cell changed.
+        """
+        row, col = state
+        if bool(self.walls[row, col]) == wall:
+            return False
+        self.walls[row, col] = wall
+        self._update_moves(row, col)
+        record_change(self, (row, col))
+        return True
+
+    def toggle_wall(self, state):
+        row, col = state
+        return self.set_wall(state, not self.walls[row, col])
+
+    def index(self, state):
+        """Flat cell id of a (row, col) state."""
+        return state[0] * self.width + state[1]
+
+    def state(self, index):
+        """(row, col) state of a flat cell id."""
+        return divmod(index, self.width)
+
+    def neighbors(self, state):
+        """Same (action, (row, col)) list as Maze.neighbors, so every solver can use this backend."""
+        row, col = state
+        return [(action, (row + dr, col + dc)) for action, dr, dc in MOVE_TABLE[self.moves[row * self.width + col]]]
+
+    def neighbor_ids(self, index):
+        """Flat ids of the free neighbors of a flat cell id."""
+        return [index + offset for offset in self.offsets[self.moves[index]]]
+
+    def adjacency(self):
+        """
+        CSR adjacency of the free cells over flat ids.
+        :return: (indptr, indices) int arrays; the neighbors of cell i are indices[indptr[i]:indptr[i + 1]].
+        """
+        mask = np.frombuffer(self.moves, dtype=np.uint8)
+        bits = (mask[:, None] >> np.arange(len(MOVES), dtype=np.uint8)) & 1
+        ids = np.arange(mask.size, dtype=np.int64)[:, None]
+        targets = ids + np.array([dr * self.width + dc for _, dr, dc in MOVES])
+        indptr = np.zeros(mask.size + 1, dtype=np.int64)
+        np.cumsum(bits.sum(axis=1), out=indptr[1:])
+        return indptr, targets[bits.astype(bool)]
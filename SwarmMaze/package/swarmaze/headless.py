@@ -0,0 +1,97 @@
+import json
+
+
+class NullVisualizer():
+    def __init__(self, maze=None, delay=0):
+        """
+        Visualizer stand-in that ignores every frame, so solvers run at full speed.
+        :param maze: The maze object being solved (kept for API compatibility).
+        :param delay: Ignored; present so it can replace Visualizer anywhere.
+        """
+        self.maze = maze
+        self.delay = delay
+
+    def draw_maze(self, agent_position=None, explored=None, solution=None):
+        pass
+
+    def wait_for_exit(self):
+        pass
+
+
+class RecordingVisualizer(NullVisualizer):
+    def __init__(self, maze=None, delay=0):
+        """
+        Headless visualizer that records the expansion order of a search.
+        The recorded log can be saved and replayed later on any visualizer.
+        """
+        super().__init__(maze, delay)
+        self.expansions = []
+        self.solution = None
+
+    def draw_maze(self, agent_position=None, explored=None, solution=None):
+        if solution is not None:
+            self.solution = list(solution)
+        elif agent_position is not None:
+            self.expansions.append(agent_position)
+
+    def save(self, filename):
+        """
+        Writes the event log as JSON lines: a header describing the maze,
+        one [row, col] line per expansion and a final solution line.
+        :param filename: Path of the log file to write.
+        """
+        with open(filename, "w") as f:
+            header = {}
+            if self.maze is not None:
+                header = {
+                    "height": self.maze.height,
+                    "width": self.maze.width,
+                    "start": list(self.maze.start),
+                    "goal": list(self.maze.goal),
+                }
+            f.write(json.dumps(header) + "\n")
+            for row, col in self.expansions:
+                f.write(f"[{row}, {col}]\n")
+            if self.solution is not None:
+                f.write(json.dumps({"solution": [list(cell) for cell in self.solution]}) + "\n")
+
+
+def read_log(filename):
+    """
+    Reads an event log written by RecordingVisualizer.save one line at a time.
+    :param filename: Path of the log file.
+    :return: The header dict and a generator of ("expand", cell) / ("solution", cells) events.
+    """
+    f = open(filename)
+    header = json.loads(f.readline())
+
+    def events():
+        with f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                if line.startswith("["):
+                    row, col = json.loads(line)
+                    yield "expand", (row, col)
+                else:
+                    cells = json.loads(line)["solution"]
+                    yield "solution", [tuple(cell) for cell in cells]
+
+    return header, events()
+
+
+def replay(filename, visualizer):
+    """
+    Replays a recorded event log on a visualizer, frame by frame.
+    :param filename: Path of the log file.
+    :param visualizer: Any object with a draw_maze method (e.g. Visualizer).
+    """
+    _, events = read_log(filename)
+    explored = set()
+    for kind, data in events:
+        if kind == "expand":
+            visualizer.draw_maze(agent_position=data, explored=explored)
+            explored.add(data)
+        else:
+            visualizer.draw_maze(solution=data)
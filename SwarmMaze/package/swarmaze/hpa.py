@@ -0,0 +1,218 @@
+import heapq
+
+from .maze import Node
+from .algorithms import PriorityQueueFrontier, ACTIONS, grid_distance
+
+
+# Entrances at least this long get a transition at each end instead of one in the middle
+LONG_ENTRANCE = 6
+
+
+class Abstraction():
+    def __init__(self, maze, cluster_size=10):
+        """
+        HPA* abstract graph of a maze. The grid is cut into square clusters;
+        transitions are placed on the free openings between neighboring clusters,
+        and every pair of transitions inside a cluster is linked by its local
+        shortest-path cost (diagonal steps cost sqrt(2) on 8-connected mazes).
+        :param maze: Maze or GridMaze to abstract.
+        :param cluster_size: Side of a cluster in cells.
+        """
+        self.maze = maze
+        self.cluster_size = cluster_size
+        self.connectivity = getattr(maze, "connectivity", 4)
+        self.edges = {}      # abstract node -> {neighbor node: cost}
+        self.clusters = {}   # cluster -> set of abstract nodes inside it
+        self.segments = {}   # (a, b) -> refined cells from a (exclusive) to b (inclusive)
+
+        self._build_entrances()
+        for cluster, nodes in self.clusters.items():
+            for node in nodes:
+                distances, _ = self.local_search(node)
+                for other in nodes:
+                    if other != node and other in distances:
+                        self._link(node, other, distances[other])
+
+    def cluster(self, state):
+        return state[0] // self.cluster_size, state[1] // self.cluster_size
+
+    def bounds(self, cluster):
+        """Row and column ranges (start inclusive, end exclusive) of a cluster."""
+        top = cluster[0] * self.cluster_size
+        left = cluster[1] * self.cluster_size
+        return (top, min(top + self.cluster_size, self.maze.height),
+                left, min(left + self.cluster_size, self.maze.width))
+
+    def free(self, row, col):
+        return not self.maze.walls[row][col]
+
+    def _link(self, a, b, cost):
+        edges = self.edges.setdefault(a, {})
+        if cost < edges.get(b, float("inf")):
+            edges[b] = cost
+
+    def _add_transition(self, a, b):
+        self.clusters.setdefault(self.cluster(a), set()).add(a)
+        self.clusters.setdefault(self.cluster(b), set()).add(b)
+        self._link(a, b, 1)
+        self._link(b, a, 1)
+
+    def _build_entrances(self):
+        size = self.cluster_size
+        height, width = self.maze.height, self.maze.width
+        # Vertical borders: cell (r, c - 1) on the left, (r, c) on the right
+        for c in range(size, width, size):
+            pairs = [((r, c - 1), (r, c)) for r in range(height)]
+            self._add_openings(pairs, lambda pair: pair[0][0] // size)
+        # Horizontal borders: cell (r - 1, c) above, (r, c) below
+        for r in range(size, height, size):
+            pairs = [((r - 1, c), (r, c)) for c in range(width)]
+            self._add_openings(pairs, lambda pair: pair[0][1] // size)
+
+    def _add_openings(self, pairs, cluster_of):
+        """Splits a border into maximal free openings per cluster and places their transitions."""
+        opening = []
+        for pair in pairs + [None]:
+            open_pair = pair is not None and self.free(*pair[0]) and self.free(*pair[1])
+            if opening and (not open_pair or cluster_of(pair) != cluster_of(opening[0])):
+                if len(opening) >= LONG_ENTRANCE:
+                    self._add_transition(*opening[0])
+                    self._add_transition(*opening[-1])
+                else:
+                    self._add_transition(*opening[len(opening) // 2])
+                opening = []
+            if open_pair:
+                opening.append(pair)
+
+    def local_search(self, source, target=None):
+        """
+        Dijkstra from source restricted to its own cluster.
+        :return: (distances, parents) dicts over the cells reached.
+        """
+        top, bottom, left, right = self.bounds(self.cluster(source))
+        distances = {source: 0}
+        parents = {source: None}
+        queue = [(0, source)]
+        while queue:
+            distance, state = heapq.heappop(queue)
+            if distance > distances[state]:
+                continue  # stale entry
+            if state == target:
+                break
+            for _, (r, c) in self.maze.neighbors(state):
+                if top <= r < bottom and left <= c < right:
+                    cost = distance + grid_distance(r - state[0], c - state[1], self.connectivity)
+                    if cost < distances.get((r, c), float("inf")):
+                        distances[(r, c)] = cost
+                        parents[(r, c)] = state
+                        heapq.heappush(queue, (cost, (r, c)))
+        return distances, parents
+
+    def refine(self, a, b):
+        """Concrete cells from a (exclusive) to b (inclusive); cached per abstract edge."""
+        segment = self.segments.get((a, b))
+        if segment is None:
+            if any(state == b for _, state in self.maze.neighbors(a)):
+                cells = [b]
+            else:
+                _, parents = self.local_search(a, target=b)
+                cells = []
+                state = b
+                while state != a:
+                    cells.append(state)
+                    state = parents[state]
+                cells.reverse()
+            segment = cells
+            # Only edges between transitions are worth keeping; start/goal edges change per query
+            if a in self.edges and b in self.edges:
+                self.segments[(a, b)] = segment
+        return segment
+
+    def connect(self, state):
+        """Costs from state to the abstract nodes of its cluster (used to insert start and goal)."""
+        distances, _ = self.local_search(state)
+        return {node: distances[node] for node in self.clusters.get(self.cluster(state), ())
+                if node in distances and node != state}
+
+
+def get_abstraction(maze, cluster_size=10):
+    """Returns the cached abstraction of a maze, building it on first use."""
+    cache = getattr(maze, "hpa_abstractions", None)
+    if cache is None:
+        cache = maze.hpa_abstractions = {}
+    key = (cluster_size, getattr(maze, "connectivity", 4))
+    if key not in cache:
+        cache[key] = Abstraction(maze, cluster_size)
+    return cache[key]
+
+
+class HPAStar():
+    def __init__(self, maze, visualizer, cluster_size=10):
+        self.maze = maze
+        self.visualizer = visualizer
+        self.cluster_size = cluster_size
+        self.connectivity = getattr(maze, "connectivity", 4)
+        self.frontier = PriorityQueueFrontier()
+        self.explored = set()
+
+    def heuristic(self, state):
+        """
+        Heuristic function: Manhattan (octile on 8-connected mazes) distance from
+        the current state to the goal.
+        """
+        x1, y1 = state
+        x2, y2 = self.maze.goal
+        return grid_distance(x1 - x2, y1 - y2, self.connectivity)
+
+    def solve(self):
+        abstraction = get_abstraction(self.maze, self.cluster_size)
+        start, goal = self.maze.start, self.maze.goal
+
+        # Temporarily insert start and goal into the abstract graph
+        extra = {start: abstraction.connect(start)}
+        for node, cost in abstraction.connect(goal).items():
+            extra.setdefault(node, {})[goal] = cost
+        if abstraction.cluster(start) == abstraction.cluster(goal):
+            distances, _ = abstraction.local_search(start, target=goal)
+            if goal in distances:
+                extra[start][goal] = distances[goal]
+
+        self.frontier.add(Node(state=start, parent=None, action=None, cost=0, heuristic=self.heuristic(start)))
+        while not self.frontier.empty():
+            node = self.frontier.remove()
+
+            # Visualize the current state
+            self.visualizer.draw_maze(agent_position=node.state, explored=self.explored)
+
+            if node.state == goal:
+                return self.reconstruct_path(abstraction, node)
+
+            self.explored.add(node.state)
+
+            edges = dict(abstraction.edges.get(node.state, {}))
+            edges.update(extra.get(node.state, {}))
+            for state, step in edges.items():
+                if state not in self.explored:
+                    child = Node(state=state, parent=node, action=None, cost=node.cost + step,
+                                 heuristic=self.heuristic(state))
+                    self.frontier.add(child)
+
+        raise Exception("No solution")
+
+    def reconstruct_path(self, abstraction, node):
+        """Refines each abstract edge of the path into concrete cells."""
+        waypoints = []
+        while node is not None:
+            waypoints.append(node.state)
+            node = node.parent
+        waypoints.reverse()
+
+        actions = []
+        cells = []
+        previous = waypoints[0]
+        for a, b in zip(waypoints, waypoints[1:]):
+            for cell in abstraction.refine(a, b):
+                actions.append(ACTIONS[(cell[0] - previous[0], cell[1] - previous[1])])
+                cells.append(cell)
+                previous = cell
+        return actions, cells
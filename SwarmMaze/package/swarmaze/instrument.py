@@ -0,0 +1,226 @@
+import heapq
+import json
+import sys
+import time
+
+from . import algorithms
+from .maze import StackFrontier
+
+
+# Counters and timers reported by SearchStats, in output order
+COUNTERS = ["expansions", "pushes", "pops", "duplicate_pushes", "peak_frontier"]
+TIMERS = ["solve", "neighbors", "heuristic", "heap"]
+
+
+def entry_state(item):
+    """State of a frontier item: a Node, a heap tuple ending in a Node or a state, or a bare state."""
+    if isinstance(item, tuple):
+        item = item[-1]
+    return getattr(item, "state", item)
+
+
+class SearchStats():
+    def __init__(self, algorithm=None, timers=TIMERS):
+        """
+        Work counters and timers of one instrumented search.
+        Timers are in seconds; nested calls (a frontier method calling heapq) are
+        only timed and counted once.
+        :param timers: Names of the timers, in output order.
+        """
+        self.algorithm = algorithm
+        self.expansions = 0
+        self.pushes = 0
+        self.pops = 0
+        self.duplicate_pushes = 0
+        self.peak_frontier = 0
+        self.times = dict.fromkeys(timers, 0.0)
+
+    def to_dict(self):
+        result = {"algorithm": self.algorithm}
+        for name in COUNTERS:
+            result[name] = getattr(self, name)
+        for name, seconds in self.times.items():
+            result[f"{name}_time"] = seconds
+        return result
+
+    def save(self, filename):
+        """Writes the stats as a JSON object."""
+        with open(filename, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def __str__(self):
+        return "\n".join(
+            [f"{name}: {getattr(self, name)}" for name in COUNTERS]
+            + [f"{name} time: {seconds:.6f}s" for name, seconds in self.times.items()]
+        )
+
+
+class HeapProxy():
+    def __init__(self, instrumentation):
+        """Stands in for the heapq module inside a solver module while it is instrumented."""
+        self.heappush = instrumentation.frontier_call(heapq.heappush, push=True)
+        self.heappop = instrumentation.frontier_call(heapq.heappop, push=False)
+
+    def __getattr__(self, name):
+        return getattr(heapq, name)
+
+
+class Instrumentation():
+    # Timers reported in the stats; subclasses instrumenting other code may add some
+    timers = TIMERS
+
+    def __init__(self, solver, algorithm=None):
+        """
+        Counts and times the work of one solver run. Nothing in the solvers is
+        changed: while attached, the maze's neighbors(), the solver's heuristic(),
+        its frontier objects, the heapq module seen by its module and the
+        visualizer's draw_maze() are wrapped on the instances, and everything is
+        restored on detach. Runs without instrumentation pay nothing.
+        Use it as a context manager around solve():
+
+            with Instrumentation(solver) as stats:
+                actions, cells = solver.solve()
+            stats.save("stats.json")
+
+        Only one run per process should be instrumented at a time, since the
+        heapq patch is module-wide. Only the outermost wrapped call is timed and
+        counted: work nested in another wrapped call belongs to that call.
+        :param solver: A constructed solver (it must not have started solving).
+        :param algorithm: Name recorded in the stats (default: the solver's class name).
+        """
+        self.solver = solver
+        self.stats = SearchStats(algorithm or type(solver).__name__, self.timers)
+        self.patches = []   # (owner, name, original or None when it was not an instance attribute)
+        self.busy = False   # True inside a wrapped call
+        self.pushed = set()
+        self.sizes = {}     # id(frontier) -> its size after the last push or pop
+        self.started = None
+
+    def __enter__(self):
+        self.attach()
+        self.started = time.perf_counter()
+        return self.stats
+
+    def __exit__(self, *exc_info):
+        self.stats.times["solve"] += time.perf_counter() - self.started
+        self.detach()
+        return False
+
+    def attach(self):
+        solver = self.solver
+        maze = getattr(solver, "maze", None)
+
+        # Neighbor generation: the solver's own methods (Theta*, FlatAStar) and the maze's
+        for owner in (solver, maze):
+            for name in ("neighbors", "neighbor_ids"):
+                if callable(getattr(owner, name, None)):
+                    self.patch(owner, name, self.timed(getattr(owner, name), "neighbors"))
+        if callable(getattr(solver, "heuristic", None)):
+            self.patch(solver, "heuristic", self.timed(solver.heuristic, "heuristic"))
+
+        # Frontier objects (StackFrontier, QueueFrontier, PriorityQueueFrontier)
+        for value in list(vars(solver).values()):
+            if isinstance(value, (StackFrontier, algorithms.PriorityQueueFrontier)):
+                self.patch(value, "add", self.frontier_call(value.add, push=True, frontier=value))
+                self.patch(value, "remove", self.frontier_call(value.remove, push=False, frontier=value))
+
+        # Raw heaps (FlatAStar, bidirectional A*, Theta*, D* Lite) go through their module's heapq
+        proxy = HeapProxy(self)
+        for module in {sys.modules[type(solver).__module__], algorithms}:
+            if getattr(module, "heapq", None) is heapq:
+                self.patch(module, "heapq", proxy)
+
+        visualizer = getattr(solver, "visualizer", None)
+        if visualizer is not None:
+            self.patch(visualizer, "draw_maze", self.counted_draw(visualizer.draw_maze))
+
+    def detach(self):
+        for owner, name, original in reversed(self.patches):
+            if original is None:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+        self.patches = []
+
+    def patch(self, owner, name, replacement):
+        # Modules keep their attribute; instances get an attribute shadowing the class method
+        own = vars(owner).get(name) if not isinstance(owner, type(sys)) else getattr(owner, name)
+        self.patches.append((owner, name, own))
+        setattr(owner, name, replacement)
+
+    def timed(self, function, timer):
+        times = self.stats.times
+        clock = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            if self.busy:
+                return function(*args, **kwargs)
+            self.busy = True
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                times[timer] += clock() - start
+                self.busy = False
+        return wrapper
+
+    def state_of(self, entry):
+        """State a pushed entry queues, for counting duplicate pushes."""
+        return entry_state(entry)
+
+    def frontier_call(self, function, push, frontier=None):
+        """
+        Wraps a push or pop. With `frontier` the wrapped function is a frontier
+        method; otherwise it is a heapq function whose first argument is the heap.
+        A push is only counted when the underlying list, deque or heap grew, since
+        a frontier may reject a node that is no cheaper than the one it queued.
+        """
+        timed = self.timed(function, "heap")
+        stats = self.stats
+
+        def wrapper(*args):
+            if self.busy:
+                return function(*args)
+            container = args[0] if frontier is None else frontier
+            storage = args[0] if frontier is None else frontier.frontier
+            before = len(storage)
+            result = timed(*args)
+            if push:
+                if len(storage) <= before:
+                    return result
+                stats.pushes += 1
+                state = self.state_of(args[-1])
+                if state in self.pushed:
+                    stats.duplicate_pushes += 1
+                else:
+                    self.pushed.add(state)
+            else:
+                stats.pops += 1
+            self.sizes[id(container)] = len(container)
+            size = sum(self.sizes.values())
+            if size > stats.peak_frontier:
+                stats.peak_frontier = size
+            return result
+        return wrapper
+
+    def counted_draw(self, draw_maze):
+        stats = self.stats
+
+        def wrapper(agent_position=None, explored=None, solution=None):
+            if agent_position is not None and solution is None:
+                stats.expansions += 1
+            return draw_maze(agent_position=agent_position, explored=explored, solution=solution)
+        return wrapper
+
+
+def profile(solver, algorithm=None):
+    """
+    Runs solver.solve() under instrumentation.
+    :return: (result, stats); result is None when the solver found no solution.
+    """
+    with Instrumentation(solver, algorithm) as stats:
+        try:
+            result = solver.solve()
+        except Exception:
+            result = None
+    return result, stats
@@ -0,0 +1,179 @@
+import os
+import struct
+
+import numpy as np
+
+from .maze import Maze
+from .grid import GridMaze
+
+
+BINARY_MAGIC = b"SMZB"
+BINARY_VERSION = 2
+# magic, version, height, width, start r/c, goal r/c, and for a sidecar the size
+# and mtime (ns) of the text file it was built from (zeros otherwise)
+BINARY_HEADER = struct.Struct("<4sHIIIIIIQq")
+BINARY_SUFFIX = ".smzb"
+
+# Bytes that str.splitlines() treats as line breaks besides "\n"
+LINE_BREAKS = b"\r\x0b\x0c\x1c\x1d\x1e"
+
+
+def _read_bytes(filename):
+    """Memory-maps the file read-only as a uint8 array (the OS pages it in on demand)."""
+    if os.path.getsize(filename) == 0:
+        return np.zeros(0, dtype=np.uint8)
+    return np.memmap(filename, dtype=np.uint8, mode="r")
+
+
+def _read_grid(filename):
+    """
+    Reads a text maze into a 2D uint8 array of its characters (short lines are
+    padded with spaces), after validating the start and goal.
+    :return: (grid, start, goal)
+    """
+    data = _read_bytes(filename)
+
+    # Rare cases fall back to byte-level normalization: non-ASCII characters
+    # become a single wall byte each, and every line break becomes "\n"
+    if data.size and data.max() >= 0x80:
+        text = data.tobytes().decode("utf-8").encode("ascii", "replace")
+        data = np.frombuffer(text, dtype=np.uint8)
+    if np.isin(data, np.frombuffer(LINE_BREAKS, dtype=np.uint8)).any():
+        text = data.tobytes().replace(b"\r\n", b"\n")
+        text = text.translate(bytes.maketrans(LINE_BREAKS, b"\n" * len(LINE_BREAKS)))
+        data = np.frombuffer(text, dtype=np.uint8)
+
+    if np.count_nonzero(data == ord("A")) != 1:
+        raise Exception("Maze must have exactly one start point (A).")
+    if np.count_nonzero(data == ord("B")) != 1:
+        raise Exception("Maze must have exactly one goal point (B).")
+
+    newline = data == ord("\n")
+    # A trailing newline does not start another line
+    if newline[-1]:
+        data = data[:-1]
+        newline = newline[:-1]
+    breaks = np.flatnonzero(newline)
+    line_starts = np.concatenate(([0], breaks + 1))
+    line_ends = np.concatenate((breaks, [data.size]))
+    height = line_starts.size
+    width = int((line_ends - line_starts).max())
+
+    grid = np.full((height, width), ord(" "), dtype=np.uint8)
+    positions = np.flatnonzero(~newline)
+    rows = np.cumsum(newline)[positions]
+    grid[rows, positions - line_starts[rows]] = data[positions]
+
+    start = tuple(int(x) for x in np.argwhere(grid == ord("A"))[0])
+    goal = tuple(int(x) for x in np.argwhere(grid == ord("B"))[0])
+    return grid, start, goal
+
+
+def parse_text(filename):
+    """
+    Vectorized parser for the text maze format ('A' start, 'B' goal, ' ' free,
+    anything else a wall; short lines are padded with free cells).
+    :return: (walls, start, goal) with walls a 2D bool array.
+    """
+    grid, start, goal = _read_grid(filename)
+    walls = (grid != ord(" ")) & (grid != ord("A")) & (grid != ord("B"))
+    return walls, start, goal
+
+
+def parse_terrain(filename):
+    """
+    Parses a terrain maze: the text format where the digits 1-9 are free cells
+    costing that much to enter (other free cells cost 1).
+    :return: (walls, start, goal, costs) with costs a 2D uint8 array.
+    """
+    grid, start, goal = _read_grid(filename)
+    digits = (grid >= ord("1")) & (grid <= ord("9"))
+    walls = (grid != ord(" ")) & (grid != ord("A")) & (grid != ord("B")) & ~digits
+    costs = np.where(digits, grid - ord("0"), 1).astype(np.uint8)
+    return walls, start, goal, costs
+
+
+def source_stamp(filename):
+    """(size, mtime in ns) of a file, recorded in a sidecar to tell when it is stale."""
+    stat = os.stat(filename)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def save_binary(filename, walls, start, goal, source=(0, 0)):
+    """
+    Writes the compact binary format: a fixed header followed by the walls
+    bit-packed in row-major order (one bit per cell).
+    :param source: source_stamp() of the text file a sidecar is built from.
+    """
+    walls = np.asarray(walls, dtype=bool)
+    height, width = walls.shape
+    with open(filename, "wb") as f:
+        f.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, height, width, *start, *goal, *source))
+        f.write(np.packbits(walls, axis=None).tobytes())
+
+
+def load_binary(filename, source=None):
+    """
+    Reads a file written by save_binary.
+    :param source: When given, the source_stamp() the file must have been built from.
+    :return: (walls, start, goal) with walls a 2D bool array.
+    """
+    data = _read_bytes(filename)
+    if data.size < BINARY_HEADER.size:
+        raise Exception(f"'{filename}' is not a binary maze file.")
+    magic, version, height, width, *cells = BINARY_HEADER.unpack(data[:BINARY_HEADER.size].tobytes())
+    if magic != BINARY_MAGIC or version != BINARY_VERSION:
+        raise Exception(f"'{filename}' is not a binary maze file.")
+    if source is not None and tuple(cells[4:]) != tuple(source):
+        raise Exception(f"Binary maze file '{filename}' is out of date.")
+    if data.size - BINARY_HEADER.size < (height * width + 7) // 8:
+        raise Exception(f"Binary maze file '{filename}' is truncated.")
+    bits = np.unpackbits(np.asarray(data[BINARY_HEADER.size:]), count=height * width)
+    return bits.astype(bool).reshape(height, width), tuple(cells[:2]), tuple(cells[2:4])
+
+
+def load_arrays(filename, cache=False):
+    """
+    Loads (walls, start, goal) from a text or binary maze file.
+    With cache=True a text maze gets a binary sidecar (maze.txt -> maze.txt.smzb)
+    that is reused while the text file keeps the size and mtime it was built
+    from, skipping text parsing.
+    """
+    if filename.endswith(BINARY_SUFFIX):
+        return load_binary(filename)
+    sidecar = filename + BINARY_SUFFIX
+    source = source_stamp(filename)
+    if cache and os.path.exists(sidecar):
+        try:
+            return load_binary(sidecar, source)
+        except Exception:
+            pass  # Corrupt or outdated sidecar: parse the text again
+    walls, start, goal = parse_text(filename)
+    if cache:
+        try:
+            save_binary(sidecar, walls, start, goal, source)
+        except OSError:
+            pass  # Read-only location: caching is best effort
+    return walls, start, goal
+
+
+def load_grid(filename, cache=False):
+    """Loads a maze file straight into a GridMaze, never building Python lists."""
+    return GridMaze(*load_arrays(filename, cache))
+
+
+def load_maze(filename, cache=False):
+    """Loads a maze file into a list-based Maze using the fast parser."""
+    walls, start, goal = load_arrays(filename, cache)
+    return Maze.from_walls(walls.tolist(), start, goal)
+
+
+def load_terrain(filename, grid=False):
+    """
+    Loads a terrain maze (see parse_terrain) with its per-cell costs.
+    :param grid: Return a GridMaze instead of a list-based Maze.
+    """
+    walls, start, goal, costs = parse_terrain(filename)
+    if grid:
+        return GridMaze(walls, start, goal, costs)
+    return Maze.from_walls(walls.tolist(), start, goal, costs.tobytes())
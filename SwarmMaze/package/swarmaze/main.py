@@ -1,58 +1,171 @@
+import argparse
 import sys
-import pygame
 from .maze import Maze
-from .visualizer import Visualizer
-from .algorithms import DFS, BFS, AStar, Dijkstra, GreedyBestFirst, RandomWalk, BidirectionalSearch, IterativeDeepeningDFS, HillClimbing
+from .headless import NullVisualizer, RecordingVisualizer, replay
+from .algorithms import DFS, BFS, AStar, FlatAStar, Dijkstra, GreedyBestFirst, RandomWalk, BidirectionalSearch, BidirectionalAStar, IterativeDeepeningDFS, IDAStar, HillClimbing, JumpPointSearch, path_cost
+from .precompute import Wavefront
+from .hpa import HPAStar
+from .dstar import DStarLite
 
 
-def main():
-    if len(sys.argv) != 3:
-        sys.exit("Usage: python main.py maze.txt [dfs|bfs|astar|dijkstra|greedy|randomwalk|bidirectional|iddfs|hillclimbing]")
+def open_window(maze, args):
+    """
+    Creates the on-screen Visualizer. pygame is only imported here, so headless
+    runs and modules that just need ALGORITHMS (benchmark, parallel, export)
+    start without loading it.
+    """
+    import pygame
+    from .visualizer import Visualizer
+    pygame.init()
+    return Visualizer(maze, delay=args.delay, incremental=args.incremental)
+
+
+def theta_star(maze, visualizer):
+    """Theta* needs NumPy, so its module is only imported when it is picked."""
+    from .anyangle import ThetaStar
+    return ThetaStar(maze, visualizer)
+
+
+# Algorithms selectable by name on the command line
+ALGORITHMS = {
+    "dfs": DFS,
+    "bfs": BFS,
+    "astar": AStar,
+    "flatastar": FlatAStar,
+    "dijkstra": Dijkstra,
+    "greedy": GreedyBestFirst,
+    "randomwalk": RandomWalk,
+    "bidirectional": BidirectionalSearch,
+    "biastar": BidirectionalAStar,
+    "iddfs": IterativeDeepeningDFS,
+    "idastar": IDAStar,
+    "hillclimbing": HillClimbing,
+    "jps": JumpPointSearch,
+    "wavefront": Wavefront,
+    "hpastar": HPAStar,
+    "dstarlite": DStarLite,
+    "thetastar": theta_star,
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="swarmaze", description="Solve a 2D maze and visualize the search.")
+    parser.add_argument("maze", help="maze file (A = start, B = goal, space = free, anything else = wall)")
+    parser.add_argument("algorithm", nargs="?", type=str.lower, choices=sorted(ALGORITHMS),
+                        help="search algorithm to run")
+    parser.add_argument("--headless", action="store_true",
+                        help="run the solver without opening a window or sleeping between frames")
+    parser.add_argument("--log", metavar="FILE",
+                        help="write the expansion event log to FILE (JSON lines) for later replay")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="replay a previously recorded event log instead of solving")
+    parser.add_argument("--grid", action="store_true",
+                        help="use the compact NumPy grid backend (requires numpy)")
+    parser.add_argument("--cache", action="store_true",
+                        help="with --grid, keep a binary copy of the maze next to it (maze.txt.smzb) "
+                             "so later runs skip parsing the text")
+    parser.add_argument("--terrain", action="store_true",
+                        help="read the digits 1-9 as free cells with that traversal cost "
+                             "(honored by dijkstra, astar and flatastar)")
+    parser.add_argument("--connectivity", type=int, choices=(4, 8), default=4,
+                        help="8 adds diagonal moves that do not cut wall corners (default: 4)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="redraw only the cells that changed each frame (much faster on big mazes)")
+    parser.add_argument("--fps", type=int,
+                        help="run the solver on its own thread and animate it at this frame rate, "
+                             "coalescing expansions into frames (ignores --delay)")
+    parser.add_argument("--delay", type=int, default=200,
+                        help="delay in milliseconds between frames (default: 200)")
+    parser.add_argument("--stats", metavar="FILE",
+                        help="count and time the solver's work (expansions, frontier operations, "
+                             "neighbors/heuristic/heap time) and write it to FILE as JSON")
+    args = parser.parse_args(argv)
+    if args.algorithm is None and args.replay is None:
+        parser.error("an algorithm is required unless --replay is given")
+    if args.headless and args.replay:
+        parser.error("--replay needs a window and cannot be combined with --headless")
+    if args.log and not args.headless:
+        parser.error("--log is only supported together with --headless")
+    if args.fps is not None and (args.headless or args.fps <= 0):
+        parser.error("--fps needs a window and a positive frame rate")
+    if args.stats and (args.replay or args.fps):
+        parser.error("--stats cannot be combined with --replay or --fps")
+    if args.cache and (not args.grid or args.terrain):
+        parser.error("--cache is only supported together with --grid and without --terrain")
+    return args
+
 
-    filename = sys.argv[1]
-    algorithm = sys.argv[2].lower()
+def main(argv=None):
+    args = parse_args(argv)
 
     # Load the maze
-    maze = Maze(filename)
-
-    # Initialize the visualizer with a delay of 200ms
-    visualizer = Visualizer(maze, delay=200)
-
-    # Choose the algorithm
-    if algorithm == "dfs":
-        solver = DFS(maze, visualizer)
-    elif algorithm == "bfs":
-        solver = BFS(maze, visualizer)
-    elif algorithm == "astar":
-        solver = AStar(maze, visualizer)
-    elif algorithm == "dijkstra":
-        solver = Dijkstra(maze, visualizer)
-    elif algorithm == "greedy":
-        solver = GreedyBestFirst(maze, visualizer)
-    elif algorithm == "randomwalk":
-        solver = RandomWalk(maze, visualizer)
-    elif algorithm == "bidirectional":
-        solver = BidirectionalSearch(maze, visualizer)
-    elif algorithm == "iddfs":
-        solver = IterativeDeepeningDFS(maze, visualizer)
-    elif algorithm == "hillclimbing":
-        solver = HillClimbing(maze, visualizer)
+    if args.grid:
+        # Vectorized loader; with --cache a binary sidecar (maze.txt.smzb) makes reloads skip parsing
+        from .loader import load_grid, load_terrain
+        try:
+            maze = load_terrain(args.maze, grid=True) if args.terrain else load_grid(args.maze, args.cache)
+        except FileNotFoundError:
+            sys.exit(f"Error: File '{args.maze}' not found.")
+        except Exception as e:
+            sys.exit(f"Error: {e}")
     else:
-        sys.exit("Invalid algorithm. Choose 'dfs', 'bfs', 'astar', 'dijkstra', 'greedy', 'randomwalk', 'bidirectional', 'iddfs', or 'hillclimbing'.")
+        maze = Maze(args.maze, terrain=args.terrain)
+
+    maze.connectivity = args.connectivity
+
+    if args.replay:
+        visualizer = open_window(maze, args)
+        replay(args.replay, visualizer)
+        visualizer.wait_for_exit()
+        return
+
+    # Headless runs skip pygame entirely; a log is only recorded when asked for
+    if args.headless:
+        visualizer = RecordingVisualizer(maze) if args.log else NullVisualizer(maze)
+    else:
+        visualizer = open_window(maze, args)
 
     print("Solving...")
+    solved = False
     try:
         # Solve the maze and visualize the solution
-        actions, cells = solver.solve()
-        visualizer.draw_maze(solution=cells)
-        print("Solution found!")
+        if args.fps:
+            from .playback import Playback
+            actions, cells = Playback(visualizer, fps=args.fps).run(ALGORITHMS[args.algorithm], maze)
+        elif args.stats:
+            from .instrument import Instrumentation
+            solver = ALGORITHMS[args.algorithm](maze, visualizer)
+            instrumentation = Instrumentation(solver, args.algorithm)
+            try:
+                with instrumentation:
+                    actions, cells = solver.solve()
+            finally:
+                instrumentation.stats.save(args.stats)
+                print(f"Search stats written to {args.stats}")
+            visualizer.draw_maze(solution=cells)
+        else:
+            solver = ALGORITHMS[args.algorithm](maze, visualizer)
+            actions, cells = solver.solve()
+            visualizer.draw_maze(solution=cells)
+        solved = True
+        print(f"Solution found! Path length: {len(cells)}")
+        if args.terrain:
+            print(f"Path cost: {path_cost(maze, cells):g}")
     except Exception as e:
         print(f"Error: {e}")
 
+    if args.log:
+        visualizer.save(args.log)
+        print(f"Event log written to {args.log}")
+
+    if args.headless:
+        if not solved:
+            sys.exit(1)
+        return
+
     # Wait for the user to close the visualization window
     visualizer.wait_for_exit()
 
 
 if __name__ == "__main__":
-    pygame.init()
-    main()
\ No newline at end of file
+    main()
@@ -1,47 +1,110 @@
 import sys
+from collections import deque
+
+# Attributes holding data precomputed from the walls (see precompute.py and hpa.py)
+PRECOMPUTED = ("distance_fields", "hpa_abstractions")
+
+
+def record_change(maze, state):
+    """Logs a changed cell on a mutable maze and drops data precomputed from the old walls."""
+    maze.changes.append(state)
+    for name in PRECOMPUTED:
+        maze.__dict__.pop(name, None)
+
+
+# Terrain mazes: these characters are free cells costing that much to enter
+TERRAIN_DIGITS = "123456789"
+
+# Extra moves of 8-connected mazes: (action, row offset, col offset)
+DIAGONAL_MOVES = (("up-left", -1, -1), ("up-right", -1, 1), ("down-left", 1, -1), ("down-right", 1, 1))
+
+
+def min_cost(walls, costs, start, goal):
+    """
+    Smallest cost of entering a free cell other than the start and the goal, used to
+    keep scaled heuristics admissible. A shortest path never re-enters the start,
+    and the heuristics count the goal's own cost separately.
+    """
+    width = len(walls[0]) if walls else 0
+    return min((costs[i * width + j] for i, row in enumerate(walls) for j, wall in enumerate(row)
+                if not wall and (i, j) != start and (i, j) != goal), default=1)
+
 
 class Node():
+    # No per-instance __dict__: search nodes are created for every push
+    __slots__ = ("state", "parent", "action", "cost", "heuristic", "f")
+
     def __init__(self, state, parent, action, cost=0, heuristic=0):
         self.state = state
         self.parent = parent
         self.action = action
         self.cost = cost
         self.heuristic = heuristic
+        self.f = cost + heuristic  # cached priority; nodes are not modified after creation
 
     def __lt__(self, other):
-        return (self.cost + self.heuristic) < (other.cost + other.heuristic)
+        return self.f < other.f
 
 
 class StackFrontier():
     def __init__(self):
         self.frontier = []
+        self.states = {}  # state -> number of queued nodes holding it
 
     def add(self, node):
         self.frontier.append(node)
+        self.states[node.state] = self.states.get(node.state, 0) + 1
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+        return state in self.states
 
     def empty(self):
         return len(self.frontier) == 0
 
+    def __len__(self):
+        return len(self.frontier)
+
+    def _discard(self, state):
+        count = self.states[state] - 1
+        if count:
+            self.states[state] = count
+        else:
+            del self.states[state]
+
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            return self.frontier.pop()
+            node = self.frontier.pop()
+            self._discard(node.state)
+            return node
 
 
 class QueueFrontier(StackFrontier):
+    def __init__(self):
+        super().__init__()
+        self.frontier = deque()
+
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            return self.frontier.pop(0)
+            node = self.frontier.popleft()
+            self._discard(node.state)
+            return node
 
 
 class Maze():
-    def __init__(self, filename):
+    # 4 (cardinal moves) or 8 (plus diagonals that do not cut a wall corner)
+    connectivity = 4
+
+    def __init__(self, filename, terrain=False):
+        """
+        :param filename: Maze text file.
+        :param terrain: Read the digits 1-9 as free cells with that traversal
+                        cost (otherwise they are walls). Costs are kept in
+                        `costs`, a flat row-major table; other free cells cost 1.
+        """
         try:
             # Read file and set height and width of maze
             with open(filename) as f:
@@ -58,8 +121,9 @@ class Maze():
             self.height = len(contents)
             self.width = max(len(line) for line in contents)
 
-            # Keep track of walls
+            # Keep track of walls (and terrain costs)
             self.walls = []
+            self.costs = bytearray([1]) * (self.height * self.width) if terrain else None
             for i in range(self.height):
                 row = []
                 for j in range(self.width):
@@ -72,18 +136,42 @@ class Maze():
                             row.append(False)
                         elif contents[i][j] == " ":
                             row.append(False)
+                        elif terrain and contents[i][j] in TERRAIN_DIGITS:
+                            self.costs[i * self.width + j] = int(contents[i][j])
+                            row.append(False)
                         else:
                             row.append(True)
                     except IndexError:
                         row.append(False)
                 self.walls.append(row)
 
+            self.min_cost = min_cost(self.walls, self.costs, self.start, self.goal) if terrain else 1
             self.solution = None
+            self.changes = []  # cells whose wall state changed, in order
         except FileNotFoundError:
             sys.exit(f"Error: File '{filename}' not found.")
         except Exception as e:
             sys.exit(f"Error: {e}")
 
+    @classmethod
+    def from_walls(cls, walls, start, goal, costs=None):
+        """
+        Builds a maze from an existing wall grid instead of a file.
+        :param walls: List of rows, each a list of bools (True = wall).
+        :param costs: Optional flat row-major sequence of per-cell traversal costs.
+        """
+        maze = cls.__new__(cls)
+        maze.walls = walls
+        maze.height = len(walls)
+        maze.width = len(walls[0]) if walls else 0
+        maze.start = tuple(start)
+        maze.goal = tuple(goal)
+        maze.costs = None if costs is None else bytearray(costs)
+        maze.min_cost = 1 if costs is None else min_cost(walls, maze.costs, maze.start, maze.goal)
+        maze.solution = None
+        maze.changes = []
+        return maze
+
     def neighbors(self, state):
         row, col = state
         candidates = [
@@ -97,4 +185,44 @@ class Maze():
         for action, (r, c) in candidates:
             if 0 <= r < self.height and 0 <= c < self.width and not self.walls[r][c]:
                 result.append((action, (r, c)))
-        return result
\ No newline at end of file
+        if self.connectivity == 8:
+            # A diagonal step needs both cells it squeezes between to be free
+            for action, dr, dc in DIAGONAL_MOVES:
+                r, c = row + dr, col + dc
+                if (0 <= r < self.height and 0 <= c < self.width and not self.walls[r][c]
+                        and not self.walls[row][c] and not self.walls[r][col]):
+                    result.append((action, (r, c)))
+        return result
+
+    @property
+    def version(self):
+        """Number of wall changes so far; pass it to changes_since() later."""
+        return len(self.changes)
+
+    def changes_since(self, version):
+        """Set of cells whose wall state changed after the given version."""
+        return set(self.changes[version:])
+
+    def set_wall(self, state, wall=True):
+        """
+        Closes (wall=True) or opens (wall=False) a cell.
+        :return: True if the cell changed.
+        """
+        row, col = state
+        if bool(self.walls[row][col]) == wall:
+            return False
+        self.walls[row][col] = wall
+        record_change(self, (row, col))
+        return True
+
+    def toggle_wall(self, state):
+        row, col = state
+        return self.set_wall(state, not self.walls[row][col])
+
+    def to_grid(self):
+        """
+        Returns a GridMaze copy of this maze: a compact NumPy-backed grid with
+        precomputed move masks. Requires NumPy.
+        """
+        from .grid import GridMaze
+        return GridMaze.from_maze(self)
@@ -0,0 +1,129 @@
+import copy
+import heapq
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+from .maze import Maze
+from .headless import NullVisualizer
+from .main import ALGORITHMS
+
+
+class SharedGrid():
+    def __init__(self, maze):
+        """
+        Copies a maze's walls (and terrain costs, if any) into shared memory
+        blocks (one byte per cell) that worker processes attach to by name
+        instead of receiving a pickled copy.
+        :param maze: Maze or GridMaze to share.
+        """
+        self.height = maze.height
+        self.width = maze.width
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, self.height * self.width))
+        for i, row in enumerate(maze.walls):
+            self.shm.buf[i * self.width:(i + 1) * self.width] = bytes(row)
+        self.costs_shm = None
+        costs = getattr(maze, "costs", None)
+        if costs is not None:
+            self.costs_shm = shared_memory.SharedMemory(create=True, size=max(1, self.height * self.width))
+            self.costs_shm.buf[:self.height * self.width] = bytes(costs)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def costs_name(self):
+        return self.costs_shm.name if self.costs_shm is not None else None
+
+    def close(self):
+        for shm in (self.shm, self.costs_shm):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Per-process state set up once by _init_worker
+_worker_shm = None
+_worker_costs_shm = None
+_worker_maze = None
+_worker_algorithm = None
+_worker_cheapest = ()  # up to three (cost, cell) of the cheapest free cells
+
+
+def _init_worker(name, costs_name, height, width, connectivity, algorithm, grid):
+    global _worker_shm, _worker_costs_shm, _worker_maze, _worker_algorithm, _worker_cheapest
+    _worker_shm = shared_memory.SharedMemory(name=name)
+    buf = _worker_shm.buf
+    if grid:
+        import numpy as np
+        from .grid import GridMaze
+        walls = np.frombuffer(buf, dtype=bool, count=height * width).reshape(height, width)
+        _worker_maze = GridMaze(walls, (0, 0), (0, 0))
+    else:
+        # Rows are zero-copy views into the shared block; walls[r][c] is 0 or 1
+        _worker_maze = Maze.__new__(Maze)
+        _worker_maze.height = height
+        _worker_maze.width = width
+        _worker_maze.walls = [buf[i * width:(i + 1) * width] for i in range(height)]
+        _worker_maze.solution = None
+        _worker_maze.changes = []
+    _worker_maze.connectivity = connectivity
+    if costs_name is not None:
+        # The solvers only index the cost table, so the shared block is used as is
+        _worker_costs_shm = shared_memory.SharedMemory(name=costs_name)
+        costs = _worker_costs_shm.buf[:height * width]
+        _worker_maze.costs = costs
+        # min_cost leaves out each instance's start and goal, so keep the three cheapest cells
+        _worker_cheapest = heapq.nsmallest(3, ((costs[i * width + j], (i, j))
+                                               for i, row in enumerate(_worker_maze.walls)
+                                               for j, wall in enumerate(row) if not wall))
+    _worker_algorithm = ALGORITHMS[algorithm]
+
+
+def _solve(index, start, goal):
+    # Shallow copy: the walls stay shared, only start/goal differ per task
+    maze = copy.copy(_worker_maze)
+    maze.start = tuple(start)
+    maze.goal = tuple(goal)
+    if _worker_cheapest:
+        # Cheapest cell to enter besides this start and goal (see maze.min_cost)
+        maze.min_cost = next((cost for cost, cell in _worker_cheapest if cell not in (maze.start, maze.goal)), 1)
+    try:
+        return index, _worker_algorithm(maze, NullVisualizer(maze)).solve()
+    except Exception as e:
+        return index, e
+
+
+def solve_many(maze, instances, algorithm="astar", max_workers=None, grid=False):
+    """
+    Solves many start/goal instances on one maze with a process pool.
+    The maze is placed in shared memory once; each task only ships its start and goal.
+    :param maze: Maze (or GridMaze) whose walls, terrain costs and connectivity are
+                 shared by every instance.
+    :param instances: Iterable of (start, goal) pairs.
+    :param algorithm: Name of the solver, as accepted by the command line.
+    :param max_workers: Number of worker processes (default: one per CPU).
+    :param grid: Solve on the NumPy grid backend inside the workers.
+    :return: Generator of (index, result) in completion order, where result is
+             the solver's (actions, cells) or the exception it raised.
+    """
+    if algorithm not in ALGORITHMS:
+        raise Exception(f"Unknown algorithm '{algorithm}'.")
+    with SharedGrid(maze) as shared:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(shared.name, shared.costs_name, shared.height, shared.width,
+                                           getattr(maze, "connectivity", 4), algorithm, grid)) as pool:
+            futures = [pool.submit(_solve, index, start, goal) for index, (start, goal) in enumerate(instances)]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                # Drop queued work if the caller stops consuming results early
+                for future in futures:
+                    future.cancel()
@@ -0,0 +1,101 @@
+import queue
+import threading
+
+import pygame
+
+
+# Sentinel queued by the solver thread when solve() returns or raises
+DONE = ("done", None)
+
+
+class QueueVisualizer():
+    def __init__(self, maze=None, delay=0):
+        """
+        Solver-side stand-in for Visualizer: every frame becomes an event on a
+        queue and draw_maze returns immediately, so the solver never waits for
+        the screen.
+        """
+        self.maze = maze
+        self.delay = delay
+        self.events = queue.SimpleQueue()
+
+    def draw_maze(self, agent_position=None, explored=None, solution=None):
+        if solution is not None:
+            self.events.put(("solution", list(solution)))
+        elif agent_position is not None:
+            self.events.put(("expand", agent_position))
+
+    def wait_for_exit(self):
+        pass
+
+
+class Playback():
+    def __init__(self, visualizer, fps=30, events_per_frame=None):
+        """
+        Animates a search at a target frame rate while the solver runs ahead on
+        its own thread. All expansions queued since the previous frame are
+        coalesced into one frame.
+        :param visualizer: The on-screen Visualizer (its delay is set to 0; the frame rate paces playback).
+        :param fps: Target frames per second.
+        :param events_per_frame: Cap on expansions shown per frame, for a steady
+                                 animation speed; None shows everything queued.
+        """
+        self.visualizer = visualizer
+        self.visualizer.delay = 0
+        self.fps = fps
+        self.events_per_frame = events_per_frame
+
+    def run(self, solver_class, maze):
+        """
+        Solves the maze on a worker thread and renders its progress on the calling
+        thread (pygame must stay on the main thread).
+        :param solver_class: Solver class, constructed as solver_class(maze, visualizer).
+        :return: The solver's (actions, cells).
+        """
+        source = QueueVisualizer(maze)
+        solver = solver_class(maze, source)
+        outcome = {}
+
+        def target():
+            try:
+                outcome["result"] = solver.solve()
+            except Exception as e:
+                outcome["error"] = e
+            finally:
+                source.events.put(DONE)
+
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+
+        clock = pygame.time.Clock()
+        explored = set()
+        agent_position = None
+        solution = None
+        done = False
+        while not done:
+            # Drain what the solver produced since the last frame
+            taken = 0
+            while self.events_per_frame is None or taken < self.events_per_frame:
+                try:
+                    kind, data = source.events.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == "expand":
+                    if agent_position is not None:
+                        explored.add(agent_position)
+                    agent_position = data
+                    taken += 1
+                elif kind == "solution":
+                    solution = data
+                else:
+                    done = True
+                    break
+            self.visualizer.draw_maze(agent_position=agent_position, explored=explored)
+            clock.tick(self.fps)
+
+        thread.join()
+        if "error" in outcome:
+            raise outcome["error"]
+        actions, cells = outcome["result"]
+        self.visualizer.draw_maze(solution=solution or cells)
+        return actions, cells
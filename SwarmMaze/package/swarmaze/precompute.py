@@ -0,0 +1,300 @@
+import argparse
+import bisect
+import struct
+from array import array
+from collections import deque
+
+from .maze import Maze, DIAGONAL_MOVES
+
+
+# Moves in the same order as Maze.neighbors; a first-move code indexes this tuple.
+# Cardinal moves come first, so fields of 4-connected mazes only ever use those.
+MOVES = (("up", -1, 0), ("down", 1, 0), ("left", 0, -1), ("right", 0, 1)) + DIAGONAL_MOVES
+NO_MOVE = len(MOVES)
+
+FIELD_MAGIC = b"SMZD"
+DATABASE_MAGIC = b"SMZP"
+HEADER = struct.Struct("<4sIIII")  # magic, height, width, goal row, goal col
+
+
+class DistanceField():
+    def __init__(self, maze, goal=None):
+        """
+        Wavefront (reverse BFS) distances from every cell to one goal, counted in
+        moves (a diagonal step of an 8-connected maze is one move).
+        Once built, any start-to-goal query is a gradient walk in O(path length).
+        :param maze: Maze or GridMaze to propagate over.
+        :param goal: Goal cell, defaults to maze.goal.
+        """
+        self.height = maze.height
+        self.width = maze.width
+        self.goal = tuple(goal if goal is not None else maze.goal)
+        self.distances = array("i", [-1]) * (self.height * self.width)
+
+        width = self.width
+        distances = self.distances
+        distances[self.goal[0] * width + self.goal[1]] = 0
+        queue = deque([self.goal])
+        while queue:
+            state = queue.popleft()
+            distance = distances[state[0] * width + state[1]] + 1
+            for _, (r, c) in maze.neighbors(state):
+                if distances[r * width + c] < 0:
+                    distances[r * width + c] = distance
+                    queue.append((r, c))
+
+    def distance(self, state):
+        """Number of moves from state to the goal, or -1 if the goal is unreachable."""
+        row, col = state
+        if not (0 <= row < self.height and 0 <= col < self.width):
+            return -1
+        return self.distances[row * self.width + col]
+
+    def first_move(self, state):
+        """Index into MOVES of the first step towards the goal, or NO_MOVE at the goal or when unreachable."""
+        distance = self.distance(state)
+        if distance <= 0:
+            return NO_MOVE
+        row, col = state
+        for code, (_, dr, dc) in enumerate(MOVES):
+            if self.distance((row + dr, col + dc)) == distance - 1:
+                # A diagonal step may not cut a wall corner; unreachable cells hold -1
+                if dr and dc and (self.distance((row + dr, col)) < 0 or self.distance((row, col + dc)) < 0):
+                    continue
+                return code
+        return NO_MOVE
+
+    def query(self, start):
+        """
+        Walks down the distance gradient from start to the goal.
+        :return: (actions, cells) in the same format as the solvers.
+        """
+        start = tuple(start)
+        if self.distance(start) < 0:
+            raise Exception("No solution")
+        actions = []
+        cells = []
+        state = start
+        while state != self.goal:
+            action, dr, dc = MOVES[self.first_move(state)]
+            state = (state[0] + dr, state[1] + dc)
+            actions.append(action)
+            cells.append(state)
+        return actions, cells
+
+    def save(self, filename):
+        """Writes the field as a small binary file: header followed by int32 distances."""
+        with open(filename, "wb") as f:
+            f.write(HEADER.pack(FIELD_MAGIC, self.height, self.width, *self.goal))
+            self.distances.tofile(f)
+
+    @classmethod
+    def load(cls, filename, maze=None):
+        """
+        Reads a field written by save().
+        :param maze: Optional maze to check the field against.
+        """
+        with open(filename, "rb") as f:
+            magic, height, width, goal_row, goal_col = HEADER.unpack(f.read(HEADER.size))
+            if magic != FIELD_MAGIC:
+                raise Exception(f"'{filename}' is not a distance field file.")
+            field = cls.__new__(cls)
+            field.height = height
+            field.width = width
+            field.goal = (goal_row, goal_col)
+            field.distances = array("i")
+            field.distances.fromfile(f, height * width)
+        if maze is not None and (maze.height, maze.width) != (height, width):
+            raise Exception(f"Distance field '{filename}' does not match the maze size.")
+        return field
+
+
+def run_length_encode(values):
+    """Row-major run-length encoding: (run start indices, run values)."""
+    starts = array("I")
+    codes = array("I")
+    previous = None
+    for index, value in enumerate(values):
+        if value != previous:
+            starts.append(index)
+            codes.append(value)
+            previous = value
+    return starts, codes
+
+
+def connected_components(maze):
+    """Labels every free cell with its component id (walls get 0)."""
+    width = maze.width
+    labels = array("I", [0]) * (maze.height * width)
+    label = 0
+    for row in range(maze.height):
+        for col in range(width):
+            if maze.walls[row][col] or labels[row * width + col]:
+                continue
+            label += 1
+            labels[row * width + col] = label
+            queue = deque([(row, col)])
+            while queue:
+                for _, (r, c) in maze.neighbors(queue.popleft()):
+                    if not labels[r * width + c]:
+                        labels[r * width + c] = label
+                        queue.append((r, c))
+    return labels
+
+
+class CompressedPathDatabase():
+    def __init__(self, maze=None, goals=()):
+        """
+        Compressed path database: for each goal, the first move from every cell,
+        run-length encoded in row-major order. Cells that cannot reach the goal
+        are wildcards that extend the current run, and neighboring cells mostly
+        share their first move, so a goal costs a few runs per row.
+        A run-length encoded component map rejects unreachable queries.
+        :param maze: Maze or GridMaze to precompute over.
+        :param goals: Goal cells to include.
+        """
+        self.height = maze.height if maze is not None else 0
+        self.width = maze.width if maze is not None else 0
+        self.components = run_length_encode(connected_components(maze)) if maze is not None else None
+        self.tables = {}  # goal -> (run start indices, run move codes)
+        for goal in goals:
+            self.add(DistanceField(maze, goal))
+
+    def add(self, field):
+        """Compresses a DistanceField into the database."""
+        starts = array("I")
+        codes = array("I")
+        previous = None
+        for index in range(field.height * field.width):
+            if field.distances[index] < 0:
+                continue
+            code = field.first_move(divmod(index, field.width))
+            if code != previous:
+                starts.append(index)
+                codes.append(code)
+                previous = code
+        self.tables[field.goal] = (starts, codes)
+
+    @staticmethod
+    def _lookup(runs, index):
+        starts, values = runs
+        return values[bisect.bisect_right(starts, index) - 1]
+
+    def component(self, state):
+        row, col = state
+        if not (0 <= row < self.height and 0 <= col < self.width):
+            return 0
+        return self._lookup(self.components, row * self.width + col)
+
+    def first_move(self, state, goal):
+        return self._lookup(self.tables[goal], state[0] * self.width + state[1])
+
+    def query(self, start, goal):
+        """
+        Follows the stored first moves from start to goal.
+        :return: (actions, cells) in the same format as the solvers.
+        """
+        start = tuple(start)
+        goal = tuple(goal)
+        if goal not in self.tables:
+            raise Exception(f"Goal {goal} is not in the path database.")
+        if not self.component(start) or self.component(start) != self.component(goal):
+            raise Exception("No solution")
+        actions = []
+        cells = []
+        state = start
+        while state != goal:
+            action, dr, dc = MOVES[self.first_move(state, goal)]
+            state = (state[0] + dr, state[1] + dc)
+            actions.append(action)
+            cells.append(state)
+        return actions, cells
+
+    def save(self, filename):
+        with open(filename, "wb") as f:
+            f.write(HEADER.pack(DATABASE_MAGIC, self.height, self.width, len(self.tables), 0))
+            for goal, (starts, values) in [(None, self.components)] + list(self.tables.items()):
+                f.write(struct.pack("<III", *(goal or (0, 0)), len(starts)))
+                starts.tofile(f)
+                values.tofile(f)
+
+    @classmethod
+    def load(cls, filename):
+        def read_runs(f):
+            goal_row, goal_col, runs = struct.unpack("<III", f.read(12))
+            starts = array("I")
+            starts.fromfile(f, runs)
+            values = array("I")
+            values.fromfile(f, runs)
+            return (goal_row, goal_col), (starts, values)
+
+        with open(filename, "rb") as f:
+            magic, height, width, count, _ = HEADER.unpack(f.read(HEADER.size))
+            if magic != DATABASE_MAGIC:
+                raise Exception(f"'{filename}' is not a path database file.")
+            database = cls()
+            database.height = height
+            database.width = width
+            _, database.components = read_runs(f)
+            for _ in range(count):
+                goal, runs = read_runs(f)
+                database.tables[goal] = runs
+        return database
+
+
+class Wavefront():
+    def __init__(self, maze, visualizer, field=None):
+        """
+        Solver that answers the query from a precomputed DistanceField, building
+        (and caching on the maze) the field for the maze's goal if none is given.
+        """
+        self.maze = maze
+        self.visualizer = visualizer
+        self.field = field
+
+    def solve(self):
+        if self.field is None or self.field.goal != tuple(self.maze.goal):
+            cache = getattr(self.maze, "distance_fields", None)
+            if cache is None:
+                cache = self.maze.distance_fields = {}
+            goal = tuple(self.maze.goal)
+            key = (goal, getattr(self.maze, "connectivity", 4))
+            if key not in cache:
+                cache[key] = DistanceField(self.maze, goal)
+            self.field = cache[key]
+
+        actions, cells = self.field.query(self.maze.start)
+        explored = set()
+        for cell in [self.maze.start] + cells[:-1]:
+            self.visualizer.draw_maze(agent_position=cell, explored=explored)
+            explored.add(cell)
+        return actions, cells
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="swarmaze-precompute",
+                                     description="Precompute goal distance fields or a compressed path database.")
+    parser.add_argument("maze", help="maze file")
+    parser.add_argument("output", help="file to write")
+    parser.add_argument("--goal", nargs=2, type=int, action="append", metavar=("ROW", "COL"),
+                        help="goal cell; repeat for several goals (default: the maze's B)")
+    parser.add_argument("--database", action="store_true",
+                        help="write a compressed path database for all goals instead of one distance field")
+    args = parser.parse_args(argv)
+
+    maze = Maze(args.maze)
+    goals = [tuple(goal) for goal in args.goal] if args.goal else [maze.goal]
+    if args.database:
+        database = CompressedPathDatabase(maze, goals)
+        database.save(args.output)
+        runs = sum(len(starts) for starts, _ in database.tables.values())
+        print(f"Path database for {len(goals)} goal(s) written to {args.output} ({runs} runs)")
+    else:
+        if len(goals) != 1:
+            parser.error("a distance field has exactly one goal; use --database for several")
+        DistanceField(maze, goals[0]).save(args.output)
+        print(f"Distance field to {goals[0]} written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
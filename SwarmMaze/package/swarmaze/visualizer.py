@@ -15,16 +15,25 @@ CELL_SIZE = 30
 
 
 class Visualizer():
-    def __init__(self, maze, delay=200):
+    def __init__(self, maze, delay=200, incremental=False):
         """
         Initializes the visualizer.
         :param maze: The maze object to visualize.
         :param delay: Delay in milliseconds between each frame.
+        :param incremental: Blit a cached wall layer once and then redraw only the
+                            cells that changed since the previous frame.
         """
         self.maze = maze
         self.screen = pygame.display.set_mode((maze.width * CELL_SIZE, maze.height * CELL_SIZE))
         pygame.display.set_caption("Maze Solver")
         self.delay = delay  # Delay in milliseconds
+        self.incremental = incremental
+
+        # State of the incremental mode: what is currently on screen
+        self.background = None
+        self.agent_position = None
+        self.explored_seen = set()
+        self.solution_seen = set()
 
     def draw_maze(self, agent_position=None, explored=None, solution=None):
         """
@@ -33,29 +42,11 @@ class Visualizer():
         :param explored: A set of explored cells.
         :param solution: A list of cells in the solution path.
         """
-        self.screen.fill(BLACK)
-
-        for i, row in enumerate(self.maze.walls):
-            for j, col in enumerate(row):
-                x = j * CELL_SIZE
-                y = i * CELL_SIZE
-
-                if col:
-                    pygame.draw.rect(self.screen, WHITE, (x, y, CELL_SIZE, CELL_SIZE))
-                elif (i, j) == self.maze.start:
-                    pygame.draw.rect(self.screen, RED, (x, y, CELL_SIZE, CELL_SIZE))
-                elif (i, j) == self.maze.goal:
-                    pygame.draw.rect(self.screen, GREEN, (x, y, CELL_SIZE, CELL_SIZE))
-                elif solution and (i, j) in solution:
-                    pygame.draw.rect(self.screen, PURPLE, (x, y, CELL_SIZE, CELL_SIZE))
-                elif explored and (i, j) in explored:
-                    pygame.draw.rect(self.screen, YELLOW, (x, y, CELL_SIZE, CELL_SIZE))
-                elif agent_position == (i, j):
-                    pygame.draw.rect(self.screen, BLUE, (x, y, CELL_SIZE, CELL_SIZE))
-
-                pygame.draw.rect(self.screen, BLACK, (x, y, CELL_SIZE, CELL_SIZE), 1)
-
-        pygame.display.flip()
+        solution = set(solution) if solution else set()
+        if self.incremental:
+            self._draw_changes(agent_position, explored or set(), solution)
+        else:
+            self._draw_full(agent_position, explored, solution)
 
         # Handle events to keep the window responsive
         for event in pygame.event.get():
@@ -66,6 +57,86 @@ class Visualizer():
         # Add a delay to slow down the visualization
         pygame.time.delay(self.delay)
 
+    def cell_color(self, cell, agent_position, explored, solution):
+        """
+        Color of a cell for the given search state, or None for the plain background.
+        """
+        i, j = cell
+        if self.maze.walls[i][j]:
+            return WHITE
+        elif cell == self.maze.start:
+            return RED
+        elif cell == self.maze.goal:
+            return GREEN
+        elif cell in solution:
+            return PURPLE
+        elif explored and cell in explored:
+            return YELLOW
+        elif agent_position == cell:
+            return BLUE
+        return None
+
+    def _draw_full(self, agent_position, explored, solution):
+        self.screen.fill(BLACK)
+
+        for i in range(self.maze.height):
+            for j in range(self.maze.width):
+                rect = (j * CELL_SIZE, i * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+                color = self.cell_color((i, j), agent_position, explored, solution)
+                if color is not None:
+                    pygame.draw.rect(self.screen, color, rect)
+                pygame.draw.rect(self.screen, BLACK, rect, 1)
+
+        pygame.display.flip()
+
+    def _static_layer(self):
+        """Surface with the walls, start, goal and grid lines, which never change during a search."""
+        surface = pygame.Surface(self.screen.get_size())
+        surface.fill(BLACK)
+        for i in range(self.maze.height):
+            for j in range(self.maze.width):
+                rect = (j * CELL_SIZE, i * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+                color = self.cell_color((i, j), None, None, ())
+                if color is not None:
+                    pygame.draw.rect(surface, color, rect)
+                pygame.draw.rect(surface, BLACK, rect, 1)
+        return surface
+
+    def _draw_changes(self, agent_position, explored, solution):
+        if self.background is None:
+            self.background = self._static_layer()
+            self.screen.blit(self.background, (0, 0))
+            pygame.display.flip()
+
+        # Solvers usually grow `explored` by exactly the previous agent cell;
+        # anything else falls back to a set difference
+        previous = self.agent_position
+        if len(explored) == len(self.explored_seen) + 1 and previous in explored and previous not in self.explored_seen:
+            changed = {previous}
+            self.explored_seen.add(previous)
+        else:
+            changed = explored ^ self.explored_seen
+            self.explored_seen = set(explored)
+
+        dirty = changed | (solution ^ self.solution_seen) | {previous, agent_position}
+        dirty.discard(None)
+        self.agent_position = agent_position
+        self.solution_seen = solution
+
+        rects = []
+        for cell in dirty:
+            i, j = cell
+            rect = pygame.Rect(j * CELL_SIZE, i * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+            color = self.cell_color(cell, agent_position, explored, solution)
+            if color is None:
+                self.screen.blit(self.background, rect, rect)
+            else:
+                pygame.draw.rect(self.screen, color, rect)
+                pygame.draw.rect(self.screen, BLACK, rect, 1)
+            rects.append(rect)
+
+        pygame.display.update(rects)
+
     def wait_for_exit(self):
         """
         Waits for the user to close the window.